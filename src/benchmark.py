@@ -0,0 +1,304 @@
+import sys
+import os
+import io
+import json
+import time
+import zlib
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+# 합치기/분할/이미지 저장 성능 측정 도구 (Qt 없이 동작 - 화면이 없는 리눅스에서도 실행 가능)
+#   python benchmark.py                                  # 기본 합성 문서로 전체 측정
+#   python benchmark.py --ops merge,split --pages 200 --json after.json
+#   python benchmark.py --json after.json --compare before.json --max-regression 10
+# 각 측정은 별도 프로세스에서 실행해 이전 측정의 메모리 사용량이 섞이지 않게 한다.
+# --compare의 기준보다 --max-regression(%) 넘게 느려진 항목이 있으면 종료 코드 1을 반환한다.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+CORPUS_KINDS = ("text", "image", "shared")
+OPERATIONS = ("merge", "split", "render")
+# 작업별 측정 모드
+MODES = {
+    "merge": ("default", "hierarchical", "optimize"),
+    "split": ("serial", "parallel", "range_group"),
+    "render": ("png", "jpg", "bmp", "extract"),
+}
+PAGE_SIZE = (595, 842)      # 합성 문서 페이지 크기 (A4, pt)
+SCAN_DPI = 100              # image 문서의 페이지 이미지 해상도
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+         "et dolore magna aliqua ut enim ad minim veniam quis nostrud exercitation ullamco laboris").split()
+
+
+def pdf_bytes(objects, root_id):
+    """ {번호: 객체 바이트}로 PDF 파일 내용을 만든다 """
+    out = bytearray(b"%PDF-1.4\n%\xE2\xE3\xCF\xD3\n")
+    offsets = {}
+    for idnum in sorted(objects):
+        offsets[idnum] = len(out)
+        out += b"%d 0 obj\n" % idnum + objects[idnum] + b"\nendobj\n"
+    size = max(objects) + 1
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for idnum in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[idnum] if idnum in offsets else b"0000000000 65535 f \n"
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, root_id, xref)
+    return bytes(out)
+
+def stream(data, entries=b""):
+    return b"<< %s /Length %d >>\nstream\n" % (entries, len(data)) + data + b"\nendstream"
+
+def text_content(rng, lines=60):
+    """ 글자가 많은 페이지 내용 스트림 """
+    parts = [b"BT /F1 10 Tf 12 TL 50 800 Td"]
+    for _ in range(lines):
+        line = " ".join(rng.choice(WORDS) for _ in range(12))
+        parts.append(b"(%s) '" % line.encode())
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+def scan_image(rng):
+    """ 스캔한 페이지처럼 페이지 전체를 덮는 JPEG 이미지 (SCAN_DPI 기준 크기) """
+    from PIL import Image
+    w, h = PAGE_SIZE[0] * SCAN_DPI // 72, PAGE_SIZE[1] * SCAN_DPI // 72
+    img = Image.effect_noise((w, h), 40 + rng.random() * 40).convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=80)
+    return w, h, buf.getvalue()
+
+def make_pdf(path, pages, kind, seed):
+    """ 합성 PDF 생성
+        text: 페이지마다 글자가 많은 내용 스트림 (글꼴 공유)
+        image: 페이지마다 전체를 덮는 JPEG 하나 (스캔 문서)
+        shared: 글자 + 모든 파일이 같은 로고 이미지/글꼴을 사용 (중복 리소스 제거 측정용) """
+    rng = random.Random(seed)
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    if kind == "shared":
+        logo = zlib.compress(random.Random(0).randbytes(64 * 1024), 0)   # 모든 파일에서 같은 내용
+        objects[4] = stream(logo, b"/Type /XObject /Subtype /Image /Width 128 /Height 128 /ColorSpace /DeviceRGB"
+                                  b" /BitsPerComponent 8 /Filter /FlateDecode")
+    kids = []
+    next_id = 5
+    for _ in range(pages):
+        if kind == "image":
+            w, h, jpeg = scan_image(rng)
+            objects[next_id] = stream(jpeg, b"/Type /XObject /Subtype /Image /Width %d /Height %d"
+                                            b" /ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode" % (w, h))
+            content = b"q %d 0 0 %d 0 0 cm /Im1 Do Q" % PAGE_SIZE
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % next_id
+        elif kind == "shared":
+            content = text_content(rng, 20) + b"\nq 64 0 0 64 480 760 cm /Logo Do Q"
+            resources = b"<< /Font << /F1 3 0 R >> /XObject << /Logo 4 0 R >> >>"
+        else:
+            content = text_content(rng)
+            resources = b"<< /Font << /F1 3 0 R >> >>"
+        objects[next_id + 1] = stream(zlib.compress(content), b"/Filter /FlateDecode")
+        objects[next_id + 2] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                                % (PAGE_SIZE + (resources, next_id + 1)))
+        kids.append(next_id + 2)
+        next_id += 3
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+    with open(path, "wb") as f:
+        f.write(pdf_bytes(objects, 1))
+
+def make_corpus(folder, files=4, pages=50, kinds=CORPUS_KINDS, seed=1):
+    """ 종류별로 files개씩 합성 PDF를 만들고 {종류: [경로, ...]} 반환. 같은 seed면 항상 같은 파일이 만들어진다. """
+    corpus = {}
+    for kind in kinds:
+        os.makedirs(os.path.join(folder, kind), exist_ok=True)
+        corpus[kind] = []
+        for i in range(files):
+            path = os.path.join(folder, kind, f"{kind}_{i + 1:03d}.pdf")
+            make_pdf(path, pages, kind, seed * 1000 + i)
+            corpus[kind].append(path)
+    return corpus
+
+def peak_children_rss_bytes():
+    # 자식 프로세스(pdftoppm, 분할 작업자) 중 가장 큰 최대 메모리 (resource 모듈이 없는 Windows는 None)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_case(case):
+    """ 측정 하나를 현재 프로세스에서 실행하고 결과 dict 반환 (--run-case로 호출됨) """
+    from pdfcore import (IMAGE_FORMATS, MERGE_MAX_OPEN, SPLIT_WORKERS, MemoryMonitor,
+                         merge_pdf_files, split_pdf, render_pdfs_to_images)
+    from PyPDF2 import PdfReader
+    op, mode, inputs, output = case["op"], case["mode"], case["inputs"], case["output"]
+    os.makedirs(output, exist_ok=True)
+    pages = sum(len(PdfReader(path).pages) for path in inputs)
+
+    with MemoryMonitor() as monitor:
+        start = time.perf_counter()
+        if op == "merge":
+            merge_pdf_files(inputs, os.path.join(output, "merged.pdf"),
+                            max_open=max(2, len(inputs) - 1) if mode == "hierarchical" else MERGE_MAX_OPEN,
+                            optimize=mode == "optimize")
+        elif op == "split":
+            for path in inputs:
+                if mode == "range_group":
+                    # 앞쪽 절반과 뒤쪽 절반을 각각 하나의 PDF로 저장
+                    n = len(PdfReader(path).pages)
+                    half = max(1, n // 2)
+                    ranges = f"1-{half},{half + 1}-{n}" if n > 1 else "1"
+                    split_pdf(path, output, "range_group", ranges, workers=SPLIT_WORKERS)
+                else:
+                    split_pdf(path, output, "all", workers=1 if mode == "serial" else SPLIT_WORKERS)
+        elif op == "render":
+            img_format, ext = IMAGE_FORMATS["png" if mode == "extract" else mode]
+            errors = render_pdfs_to_images(inputs, output, img_format, ext, case["dpi"], extract=mode == "extract",
+                                           renderer=case["renderer"])
+            failed = [str(e) for e in errors.values() if e is not None]
+            if failed:
+                raise RuntimeError("; ".join(failed))
+        wall = time.perf_counter() - start
+    return {"pages": pages, "wall_seconds": wall, "peak_rss_bytes": monitor.peak,
+            "children_peak_rss_bytes": peak_children_rss_bytes()}
+
+def run_case_process(case):
+    """ 새 파이썬 프로세스에서 측정 하나를 실행 """
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(case)],
+                          cwd=HERE, capture_output=True, text=True)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        errors = proc.stderr.strip().splitlines()
+        raise RuntimeError(errors[-1] if errors else f"종료 코드 {proc.returncode}")
+    return json.loads(lines[-1])
+
+def renderer_available(renderer, pdf_path):
+    try:
+        from renderers import get_renderer
+        get_renderer(renderer).info(pdf_path)
+        return True
+    except Exception:
+        return False
+
+def run_benchmarks(corpus, ops, repeat=3, dpi=100, work_dir=None, renderer="auto", split_corpus=None):
+    """ 작업/모드/문서 종류별로 repeat번씩 측정해 중앙값을 기록한 결과 목록
+        split_corpus가 있으면 분할은 그 문서로 측정한다 """
+    results = []
+    can_render = renderer_available(renderer, next(iter(corpus.values()))[0])
+    for op in ops:
+        for mode in MODES[op]:
+            op_corpus = split_corpus if op == "split" and split_corpus else corpus
+            for kind, inputs in op_corpus.items():
+                name = f"{op}/{mode}/{kind}"
+                if op == "render" and not can_render:
+                    results.append({"case": name, "op": op, "mode": mode, "corpus": kind,
+                                    "skipped": f"{renderer} 렌더러를 사용할 수 없음"})
+                    print(f"{name:32s} 건너뜀 ({renderer} 렌더러를 사용할 수 없음)")
+                    continue
+                runs = []
+                try:
+                    for i in range(repeat):
+                        output = os.path.join(work_dir, "out", name.replace("/", "_"), str(i))
+                        runs.append(run_case_process({"op": op, "mode": mode, "inputs": inputs,
+                                                      "output": output, "dpi": dpi, "renderer": renderer}))
+                        shutil.rmtree(output, ignore_errors=True)
+                except RuntimeError as e:
+                    results.append({"case": name, "op": op, "mode": mode, "corpus": kind, "error": str(e)})
+                    print(f"{name:32s} 실패: {e}", file=sys.stderr)
+                    continue
+                wall = statistics.median(r["wall_seconds"] for r in runs)
+                pages = runs[0]["pages"]
+                children = [r["children_peak_rss_bytes"] for r in runs if r["children_peak_rss_bytes"] is not None]
+                result = {"case": name, "op": op, "mode": mode, "corpus": kind, "pages": pages,
+                          "wall_seconds": wall, "pages_per_second": pages / wall if wall else None,
+                          "peak_rss_bytes": max(r["peak_rss_bytes"] for r in runs),
+                          "children_peak_rss_bytes": max(children) if children else None,
+                          "runs": [r["wall_seconds"] for r in runs]}
+                results.append(result)
+                print(f"{name:32s} {wall:8.3f} s  {result['pages_per_second']:9.1f} pages/s  "
+                      f"최대 메모리 {result['peak_rss_bytes'] / 1024 / 1024:7.1f} MB")
+    return results
+
+def compare_results(results, baseline, max_regression):
+    """ 기준 결과와 비교해 출력하고, max_regression(%)보다 느려진 항목 이름 목록 반환 """
+    before = {r["case"]: r for r in baseline.get("results", []) if "wall_seconds" in r}
+    regressions = []
+    print("기준 대비:")
+    for r in results:
+        base = before.get(r["case"])
+        if base is None or "wall_seconds" not in r:
+            continue
+        change = (r["wall_seconds"] / base["wall_seconds"] - 1) * 100 if base["wall_seconds"] else 0.0
+        memory = (r["peak_rss_bytes"] - base["peak_rss_bytes"]) / 1024 / 1024
+        print(f"  {r['case']:32s} 시간 {change:+6.1f}%  메모리 {memory:+7.1f} MB")
+        if max_regression is not None and change > max_regression:
+            regressions.append(r["case"])
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDFManager 합치기/분할/이미지 저장 성능 측정")
+    parser.add_argument("--ops", default=",".join(OPERATIONS), help="측정할 작업 (쉼표로 구분)")
+    parser.add_argument("--kinds", default=",".join(CORPUS_KINDS), help="합성 문서 종류 (text,image,shared)")
+    parser.add_argument("--files", type=int, default=4, help="종류별 문서 수")
+    parser.add_argument("--pages", type=int, default=50, help="문서당 페이지 수")
+    parser.add_argument("--seed", type=int, default=1, help="합성 문서 생성 시드")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--dpi", type=int, default=100, help="이미지 저장 해상도")
+    parser.add_argument("--renderer", choices=("auto", "poppler", "pdfium"), default="auto",
+                        help="이미지 저장에 사용할 렌더러")
+    parser.add_argument("--corpus-dir", help="합성 문서를 만들 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--max-regression", type=float, help="기준보다 이 비율(%%) 넘게 느려지면 실패")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    ops = [op for op in args.ops.split(",") if op]
+    kinds = [kind for kind in args.kinds.split(",") if kind]
+    for name, values, allowed in (("작업", ops, OPERATIONS), ("문서 종류", kinds, CORPUS_KINDS)):
+        unknown = set(values) - set(allowed)
+        if unknown:
+            parser.error(f"알 수 없는 {name}: {', '.join(sorted(unknown))}")
+
+    from pdfcore import SPLIT_PARALLEL_MIN_PAGES
+    # 분할은 페이지가 적으면 작업자 프로세스를 쓰지 않으므로 serial/parallel 비교가 되도록 페이지를 늘린 문서로 측정
+    split_pages = max(args.pages, SPLIT_PARALLEL_MIN_PAGES * 2)
+    work_dir = args.corpus_dir or tempfile.mkdtemp(prefix="pdfmanager_bench_")
+    try:
+        corpus = make_corpus(os.path.join(work_dir, "corpus"), args.files, args.pages, kinds, args.seed)
+        split_corpus = None
+        if "split" in ops and split_pages > args.pages:
+            split_corpus = make_corpus(os.path.join(work_dir, "corpus_split"), args.files, split_pages, kinds,
+                                       args.seed)
+        results = run_benchmarks(corpus, ops, args.repeat, args.dpi, work_dir, args.renderer, split_corpus)
+    finally:
+        if not args.corpus_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    from pdfcore import VERSION
+    report = {"version": VERSION, "python": platform.python_version(), "platform": platform.platform(),
+              "cpu_count": os.cpu_count(),
+              "corpus": {"kinds": kinds, "files": args.files, "pages": args.pages, "split_pages": split_pages,
+                         "seed": args.seed},
+              "repeat": args.repeat, "dpi": args.dpi, "renderer": args.renderer, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_results(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"기준 초과: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
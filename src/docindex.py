@@ -0,0 +1,116 @@
+import os
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+from pdfcore import APP_NAME, check_cancel, report, flatten_outline
+from tracing import span
+from pdfinput import open_reader
+
+# 드롭된 PDF의 메타데이터(페이지 수, 페이지 크기, 암호화 여부, 목차) 색인.
+# (경로, 크기, 수정 시각)이 같으면 파일을 다시 열지 않고 SQLite 캐시의 값을 사용한다.
+
+DocInfo = namedtuple("DocInfo", "path size mtime page_count page_sizes encrypted outline")
+
+
+def default_cache_dir():
+    """ 사용자별 캐시 폴더 (Windows: %LOCALAPPDATA%\\PDFManager, 그 외: ~/.cache/PDFManager) """
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_NAME)
+
+def file_key(path):
+    # 캐시 키: (크기, 수정 시각 ns) - 내용이 바뀌면 둘 중 하나는 달라진다
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def read_document_info(path):
+    """ PDF를 열어 메타데이터를 읽는다. 암호가 걸린 파일은 빈 암호로 열리지 않으면 페이지 정보 없이 반환 """
+    size, mtime = file_key(path)
+    with open_reader(path) as reader:
+        return _read_document_info(reader, path, size, mtime)
+
+def _read_document_info(reader, path, size, mtime):
+    encrypted = reader.is_encrypted
+    if encrypted:
+        try:
+            if not reader.decrypt(""):
+                return DocInfo(path, size, mtime, None, [], True, [])
+        except Exception:
+            return DocInfo(path, size, mtime, None, [], True, [])
+    page_sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in reader.pages]
+    try:
+        outline = flatten_outline(reader, reader.outline)
+    except Exception:
+        outline = []
+    return DocInfo(path, size, mtime, len(page_sizes), page_sizes, encrypted, outline)
+
+
+class DocumentIndex:
+    """ 스레드 간에 공유해서 사용하는 문서 메타데이터 색인 """
+    def __init__(self, db_path=None):
+        if db_path is None:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            db_path = os.path.join(default_cache_dir(), "docindex.sqlite3")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, page_count INTEGER,"
+                " page_sizes TEXT, encrypted INTEGER, outline TEXT)"
+            )
+
+    def lookup(self, path):
+        """ 캐시에 있고 파일이 바뀌지 않았으면 DocInfo, 아니면 None (파일을 열지 않음) """
+        try:
+            size, mtime = file_key(path)
+        except OSError:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT page_count, page_sizes, encrypted, outline FROM documents"
+                " WHERE path = ? AND size = ? AND mtime = ?", (path, size, mtime)).fetchone()
+        if row is None:
+            return None
+        page_count, page_sizes, encrypted, outline = row
+        return DocInfo(path, size, mtime, page_count,
+                       [tuple(s) for s in json.loads(page_sizes)], bool(encrypted),
+                       [tuple(o) for o in json.loads(outline)])
+
+    def store(self, info):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (info.path, info.size, info.mtime, info.page_count,
+                 json.dumps(info.page_sizes), int(info.encrypted), json.dumps(info.outline, ensure_ascii=False)))
+
+    def get(self, path):
+        """ 캐시된 값이 유효하면 그대로, 아니면 파일을 읽어 색인에 저장 후 반환 """
+        info = self.lookup(path)
+        if info is None:
+            with span("open", path=path, index=True) as s:
+                info = read_document_info(path)
+                s.update(bytes=info.size, pages=info.page_count)
+            self.store(info)
+        return info
+
+    def page_count(self, path):
+        return self.get(path).page_count
+
+    def index_paths(self, paths, progress=None, cancel=None):
+        """ 여러 파일을 색인한다. 읽을 수 없는 파일은 건너뛰고 {경로: 예외}로 반환 """
+        errors = {}
+        for i, path in enumerate(paths):
+            check_cancel(cancel)
+            try:
+                self.get(path)
+            except Exception as e:
+                errors[path] = e
+            report(progress, i + 1, len(paths))
+        return errors
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,115 @@
+import os
+import time
+from pdfcore import check_cancel
+
+# 파일 목록 자료 구조와 폴더 검색 (Qt 없이 동작 - pdfmanager.py의 목록 모델이 사용)
+# 수만 개의 파일에서도 중복 확인과 위치 찾기는 사전으로 바로 하고,
+# 삭제/순서 변경은 파일 수만큼이 아니라 한 번의 목록 재구성으로 처리한다.
+
+SCAN_BATCH_SIZE = 500       # 폴더 검색 결과를 목록에 넘기는 단위
+SCAN_BATCH_SECONDS = 0.2    # 이 시간이 지나면 덜 모였어도 넘긴다 (첫 결과가 빨리 보이도록)
+
+
+class OrderedPaths:
+    """ 순서가 있는 경로 목록 + 경로 -> 위치 색인 """
+    def __init__(self):
+        self.paths = []
+        self.rows = {}  # 경로 -> 위치
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, row):
+        return self.paths[row]
+
+    def __contains__(self, path):
+        return path in self.rows
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def row(self, path):
+        """ 경로의 위치 (없으면 None) """
+        return self.rows.get(path)
+
+    def reindex(self, start=0):
+        for i in range(start, len(self.paths)):
+            self.rows[self.paths[i]] = i
+
+    def new_paths(self, paths):
+        """ 목록에 없는 경로만 순서대로 (paths 안의 중복도 제외) """
+        seen = set()
+        result = []
+        for path in paths:
+            if path not in self.rows and path not in seen:
+                seen.add(path)
+                result.append(path)
+        return result
+
+    def extend(self, paths):
+        """ 목록 끝에 추가 (중복 확인은 new_paths로 미리 한다) """
+        start = len(self.paths)
+        self.paths.extend(paths)
+        self.reindex(start)
+
+    def remove_rows(self, rows):
+        """ 여러 위치를 한 번에 삭제하고 삭제된 경로 목록을 반환 """
+        rows = set(rows)
+        if not rows:
+            return []
+        removed = [self.paths[i] for i in sorted(rows)]
+        for path in removed:
+            del self.rows[path]
+        first = min(rows)
+        self.paths[first:] = [path for i, path in enumerate(self.paths[first:], start=first) if i not in rows]
+        self.reindex(first)
+        return removed
+
+    def move_rows(self, rows, dest):
+        """ rows 위치의 항목들을 순서대로 dest 위치(이동 전 기준) 앞으로 옮긴다 """
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        moving = [self.paths[i] for i in rows]
+        row_set = set(rows)
+        rest = [path for i, path in enumerate(self.paths) if i not in row_set]
+        dest -= sum(1 for i in rows if i < dest)
+        self.paths = rest[:dest] + moving + rest[dest:]
+        self.reindex(min(rows[0], dest))
+
+    def clear(self):
+        self.paths.clear()
+        self.rows.clear()
+
+
+def scan_pdf_paths(paths, on_batch, cancel=None, progress=None, batch_size=SCAN_BATCH_SIZE):
+    """ 파일과 폴더(하위 폴더 포함)에서 .pdf 파일을 찾아 on_batch(경로 목록)으로 조금씩 넘긴다.
+        경로는 os.path.normpath로 정규화하고 폴더 안은 이름 순으로 찾는다. 찾은 파일 수를 반환.
+        전체 수를 미리 알 수 없으므로 progress(작업 스레드 공통 인자)는 사용하지 않는다. """
+    batch = []
+    last = time.monotonic()
+    found = 0
+
+    def flush():
+        nonlocal batch, last, found
+        if batch:
+            on_batch(batch)
+            found += len(batch)
+            batch = []
+        last = time.monotonic()
+
+    for path in paths:
+        check_cancel(cancel)
+        path = os.path.normpath(path)
+        if not os.path.isdir(path):
+            if path.lower().endswith(".pdf"):
+                batch.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            check_cancel(cancel)
+            dirs.sort()
+            batch.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(".pdf"))
+            if len(batch) >= batch_size or time.monotonic() - last >= SCAN_BATCH_SECONDS:
+                flush()
+    flush()
+    return found
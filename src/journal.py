@@ -0,0 +1,87 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from docindex import default_cache_dir, file_key
+
+# 작업 진행 기록(journal). 작업이 중간에 실패하거나 취소되어도 다시 실행하면 끝난 출력은 건너뛴다.
+# 기록 파일 이름은 (작업 종류, 입력 파일의 경로/크기/수정 시각, 출력 위치, 옵션)의 해시이므로
+# 입력이나 옵션이 바뀌면 새 기록으로 처음부터 실행한다.
+# 각 줄은 {"key": 완료 단위(분할 파일, 페이지 등), "outputs": [[경로, 크기, 수정 시각 ns], ...]}이며,
+# 출력 파일이 지워졌거나 크기/수정 시각이 다르면 완료되지 않은 것으로 보고 다시 만든다.
+
+JOURNAL_DIR = "journals"
+JOURNAL_MAX_AGE_DAYS = 30   # 이보다 오래 쓰지 않은 기록 파일은 삭제
+
+
+def job_signature(op, inputs, output, options):
+    """ 작업 내용을 나타내는 해시 (입력 파일이 바뀌면 달라짐) """
+    data = {
+        "op": op,
+        "inputs": [[os.path.abspath(path), *file_key(path)] for path in inputs],
+        "output": os.path.abspath(output),
+        "options": options,
+    }
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+def prune_journals(folder, max_age_days=JOURNAL_MAX_AGE_DAYS):
+    limit = time.time() - max_age_days * 86400
+    for entry in os.scandir(folder):
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < limit:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class JobJournal:
+    """ 여러 스레드에서 함께 사용하는 작업 진행 기록 """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}   # key -> [[경로, 크기, 수정 시각], ...]
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry["outputs"]
+                    except (ValueError, KeyError):
+                        continue    # 기록 중 중단된 마지막 줄
+        except FileNotFoundError:
+            pass
+
+    def is_done(self, key):
+        """ key가 완료되었고 그때 만든 출력 파일이 그대로 있는지 """
+        with self.lock:
+            outputs = self.entries.get(key)
+        if outputs is None:
+            return False
+        for path, size, mtime in outputs:
+            try:
+                if file_key(path) != (size, mtime):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def done(self, key, paths):
+        """ key의 출력 파일 paths가 모두 만들어졌음을 기록 """
+        outputs = [[path, *file_key(path)] for path in paths]
+        line = json.dumps({"key": key, "outputs": outputs}, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.entries[key] = outputs
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def open_journal(op, inputs, output, options=None, folder=None):
+    """ 같은 작업의 기록이 있으면 이어서, 없으면 새로 연다 """
+    folder = folder or os.path.join(default_cache_dir(), JOURNAL_DIR)
+    os.makedirs(folder, exist_ok=True)
+    prune_journals(folder)
+    return JobJournal(os.path.join(folder, job_signature(op, inputs, output, options or {}) + ".jsonl"))
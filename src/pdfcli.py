@@ -0,0 +1,316 @@
+import sys
+import os
+import csv
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pdfcore import (
+    APP_NAME, VERSION, RENDER_MEMORY_LIMIT_MB, RENDER_WORKERS, MERGE_MAX_OPEN, IMAGE_FORMATS, SPLIT_OPTIONS,
+    JPEG_QUALITY, PNG_COMPRESS_LEVEL, EncodeOptions, RENDERERS, DEFAULT_RENDERER,
+    merge_pdf_files, split_pdf, render_pdfs_to_images
+)
+from renderers import set_poppler_path, find_poppler_path, poppler_available, benchmark_renderers
+from tracing import tracer, span
+from journal import open_journal
+from watch import (
+    HotFolder, WATCH_OPS, WATCH_WORKERS, WATCH_QUEUE_SIZE, WATCH_SETTLE_SECONDS, WATCH_POLL_SECONDS,
+    WATCH_BATCH_SIZE, WATCH_BATCH_SECONDS
+)
+
+# PDFManager 명령줄 도구 (Qt 없이 동작 - 리눅스 서버 등에서 사용)
+# pyinstaller --onefile --name pdfmanager pdfcli.py
+#
+#   pdfmanager merge result.pdf a.pdf b.pdf
+#   pdfmanager split a.pdf -o out --mode range_each --ranges 1-3,5
+#   pdfmanager render a.pdf b.pdf -o images --format png --dpi 200
+#   pdfmanager render scan.pdf -o images --extract
+#   pdfmanager renderers a.pdf --dpi 150        # Poppler / PDFium 중 어느 쪽이 빠른지 비교
+#   pdfmanager batch jobs.json --jobs 4
+#   pdfmanager watch \\scanner\in -o images --op render --format jpg     # 들어오는 PDF를 계속 처리 (Ctrl+C로 종료)
+#
+# 같은 입력과 옵션으로 다시 실행하면 이전 실행에서 완성된 출력 파일은 건너뛴다 (--no-resume으로 끔).
+
+
+def load_manifest(manifest_path):
+    """ JSON(작업 객체 리스트) 또는 CSV(헤더: op,input,output,mode,ranges,format,dpi,...) 작업 목록을 읽는다.
+        CSV의 input 열은 ';'로 여러 파일을 구분하며, 상대 경로는 작업 목록 파일 위치 기준으로 해석한다. """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    if manifest_path.lower().endswith(".csv"):
+        with open(manifest_path, newline="", encoding="utf-8-sig") as f:
+            jobs = []
+            for row in csv.DictReader(f):
+                job = {k: v for k, v in row.items() if k and v not in (None, "")}
+                job["inputs"] = [p for p in job.pop("input", "").split(";") if p]
+                jobs.append(job)
+    else:
+        with open(manifest_path, encoding="utf-8") as f:
+            jobs = json.load(f)
+        if isinstance(jobs, dict):
+            jobs = jobs.get("jobs", [])
+        for job in jobs:
+            if "input" in job:
+                job["inputs"] = [job.pop("input")]
+
+    for job in jobs:
+        job["inputs"] = [os.path.join(base_dir, p) for p in job.get("inputs", [])]
+        if "output" in job:
+            job["output"] = os.path.join(base_dir, job["output"])
+    return jobs
+
+def as_bool(value):
+    # JSON의 true/false와 CSV의 문자열("1", "true", "yes") 모두 허용
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+def job_journal(job, inputs, output, **options):
+    # 작업 목록의 "resume": false이면 작업 기록 없이 처음부터 실행
+    if not as_bool(job.get("resume", True)):
+        return None
+    return open_journal(job.get("op"), inputs, output, options)
+
+def run_job(job, render_workers=RENDER_WORKERS):
+    """ 작업 하나를 실행한다. job: {"op": "merge"|"split"|"render", "inputs": [...], "output": ..., ...} """
+    with span("job", op=job.get("op"), output=job.get("output")):
+        return _run_job(job, render_workers)
+
+def _run_job(job, render_workers):
+    op = job.get("op")
+    inputs = job.get("inputs", [])
+    output = job.get("output")
+    if not inputs or not output:
+        raise ValueError("inputs와 output이 필요합니다.")
+
+    if op == "merge":
+        optimize, recompress = as_bool(job.get("optimize")), as_bool(job.get("recompress"))
+        os.makedirs(os.path.dirname(os.path.abspath(output)) or ".", exist_ok=True)
+        result = merge_pdf_files(inputs, output, max_open=int(job.get("max_open", MERGE_MAX_OPEN)),
+                                 optimize=optimize, recompress=recompress,
+                                 journal=job_journal(job, inputs, output, optimize=optimize, recompress=recompress))
+        mb = 1024 * 1024
+        return [f"{result.path} ({result.size_before / mb:.1f} MB -> {result.size_after / mb:.1f} MB, "
+                f"저장 {result.write_seconds:.2f}초, 최대 메모리 {result.peak_rss_bytes / mb:.0f} MB)"]
+    elif op == "split":
+        mode = job.get("mode", "all")
+        if mode not in SPLIT_OPTIONS:
+            raise ValueError(f"알 수 없는 분할 옵션: {mode}")
+        os.makedirs(output, exist_ok=True)
+        outputs = []
+        for pdf_path in inputs:
+            journal = job_journal(job, [pdf_path], output, mode=mode, ranges=job.get("ranges"))
+            outputs.extend(split_pdf(pdf_path, output, mode, job.get("ranges"), journal=journal))
+        return outputs
+    elif op == "render":
+        fmt = str(job.get("format", "png")).lower()
+        if fmt not in IMAGE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 포맷: {fmt}")
+        img_format, ext = IMAGE_FORMATS[fmt]
+        encode = EncodeOptions(int(job.get("jpeg_quality", JPEG_QUALITY)),
+                               int(job.get("png_level", PNG_COMPRESS_LEVEL)),
+                               as_bool(job.get("multipage_tiff")))
+        dpi, extract, renderer = int(job.get("dpi", 200)), as_bool(job.get("extract")), \
+            job.get("renderer", DEFAULT_RENDERER)
+        os.makedirs(output, exist_ok=True)
+        journal = job_journal(job, inputs, output, format=img_format, dpi=dpi, encode=encode, extract=extract,
+                              renderer=renderer)
+        errors = render_pdfs_to_images(
+            inputs, output, img_format, ext, dpi,
+            int(job.get("memory_limit_mb", RENDER_MEMORY_LIMIT_MB)), int(job.get("workers", render_workers)),
+            encode=encode, extract=extract, renderer=renderer, journal=journal
+        )
+        failed = {path: e for path, e in errors.items() if e is not None}
+        if failed:
+            raise RuntimeError("; ".join(f"{path}: {e}" for path, e in failed.items()))
+        return [output]
+    raise ValueError(f"알 수 없는 작업: {op}")
+
+def render_workers_per_job(max_jobs):
+    # 동시에 실행되는 작업끼리 렌더링 스레드를 나눠 쓴다
+    return max(1, RENDER_WORKERS // max(1, max_jobs))
+
+def run_batch(jobs, max_jobs=1):
+    """ 작업 목록을 max_jobs개씩 동시에 실행하고 결과를 한 줄씩 출력한다. 실패한 작업 수를 반환. """
+    max_jobs = max(1, max_jobs)
+    render_workers = render_workers_per_job(max_jobs)
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+        futures = {pool.submit(run_job, job, render_workers): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            job = jobs[i]
+            try:
+                outputs = future.result()
+                print(f"[{i + 1}/{len(jobs)}] OK {job.get('op')} -> {', '.join(outputs)}")
+            except Exception as e:
+                failures += 1
+                print(f"[{i + 1}/{len(jobs)}] FAIL {job.get('op')}: {e}", file=sys.stderr)
+    print(f"완료: {len(jobs) - failures}/{len(jobs)} 성공")
+    return failures
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pdfmanager", description=f"{APP_NAME} {VERSION} 명령줄 도구")
+    parser.add_argument("--trace", help="단계별 소요 시간을 JSON lines로 기록할 파일 (5MB마다 순환)")
+    parser.add_argument("--stats", action="store_true", help="끝난 뒤 단계별 소요 시간 합계 출력")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="이전 실행 기록을 무시하고 모든 출력을 다시 만듦 (작업 목록에서는 \"resume\": false)")
+    parser.add_argument("--poppler-path", help="Poppler bin 폴더 (기본: 환경 변수 PDFMANAGER_POPPLER_PATH, "
+                                               "동봉된 poppler_bin, PATH 순으로 찾음)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("merge", help="PDF 합치기")
+    p.add_argument("output")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("--max-open", type=int, default=MERGE_MAX_OPEN, help="한 번에 열어 둘 최대 입력 파일 수")
+    p.add_argument("--optimize", action="store_true", help="같은 폰트/이미지 등 중복 리소스를 한 번만 저장")
+    p.add_argument("--recompress", action="store_true", help="압축되지 않은 스트림 압축 (--optimize와 함께 사용)")
+
+    p = sub.add_parser("split", help="PDF 분할")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("-o", "--output", required=True, help="저장할 폴더")
+    p.add_argument("--mode", choices=SPLIT_OPTIONS, default="all")
+    p.add_argument("--ranges", help="페이지 범위 (예: 1-3,5)")
+
+    p = sub.add_parser("render", help="PDF 이미지로 저장")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("-o", "--output", required=True, help="저장할 폴더")
+    p.add_argument("--format", choices=sorted(IMAGE_FORMATS), default="png")
+    p.add_argument("--dpi", type=int, default=200)
+    p.add_argument("--memory-limit", type=int, default=RENDER_MEMORY_LIMIT_MB, help="렌더링 메모리 한도(MB)")
+    p.add_argument("--workers", type=int, default=RENDER_WORKERS, help="동시 렌더링 작업 수")
+    p.add_argument("--jpeg-quality", type=int, default=JPEG_QUALITY, help="JPEG 품질 (1~95)")
+    p.add_argument("--png-level", type=int, default=PNG_COMPRESS_LEVEL,
+                   help="PNG 압축 수준 (0~9, 기본값이 아니면 PIL로 저장해서 느려짐)")
+    p.add_argument("--multipage-tiff", action="store_true", help="TIFF를 문서마다 하나의 파일(여러 페이지)로 저장")
+    p.add_argument("--renderer", choices=RENDERERS, default=DEFAULT_RENDERER,
+                   help="렌더링 방식 (poppler: pdftoppm 프로세스, pdfium: 프로그램 안에서 렌더링)")
+    p.add_argument("--extract", action="store_true",
+                   help="스캔 페이지는 렌더링하지 않고 원본 이미지를 그대로 저장 (나머지 페이지만 렌더링)")
+
+    p = sub.add_parser("renderers", help="문서별로 사용할 수 있는 렌더러의 속도 비교")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("--dpi", type=int, default=150)
+    p.add_argument("--pages", type=int, default=5, help="렌더링할 앞쪽 페이지 수")
+
+    p = sub.add_parser("watch", help="폴더를 감시해 새로 들어온 PDF를 자동으로 처리")
+    p.add_argument("folders", nargs="+", help="감시할 폴더 (처리한 원본은 폴더 안 done/, failed/로 옮김)")
+    p.add_argument("--op", choices=WATCH_OPS, help="적용할 작업 (기본: render, merge는 묶음마다 한 파일)")
+    p.add_argument("-o", "--output", help="저장할 폴더")
+    p.add_argument("--config", help="작업 설정 JSON (작업 목록의 작업 하나와 같은 형식, inputs 제외)")
+    p.add_argument("--mode", choices=SPLIT_OPTIONS, help="split: 분할 옵션")
+    p.add_argument("--ranges", help="split: 페이지 범위")
+    p.add_argument("--format", choices=sorted(IMAGE_FORMATS), help="render: 이미지 포맷")
+    p.add_argument("--dpi", type=int, help="render: 해상도")
+    p.add_argument("-j", "--jobs", type=int, default=WATCH_WORKERS, help="동시에 실행할 작업 수")
+    p.add_argument("--queue", type=int, default=WATCH_QUEUE_SIZE,
+                   help="실행 중 + 대기 중인 작업의 최대 수 (넘으면 파일을 폴더에 남겨 둠)")
+    p.add_argument("--settle", type=float, default=WATCH_SETTLE_SECONDS,
+                   help="파일 크기가 이 시간(초) 동안 바뀌지 않으면 처리 시작")
+    p.add_argument("--poll", type=float, default=WATCH_POLL_SECONDS, help="폴더 확인 간격(초)")
+    p.add_argument("--batch-size", type=int, default=WATCH_BATCH_SIZE, help="merge: 한 파일로 합칠 최대 입력 수")
+    p.add_argument("--batch-seconds", type=float, default=WATCH_BATCH_SECONDS,
+                   help="merge: 첫 파일 뒤 이 시간(초)이 지나면 모인 만큼 합침")
+    p.add_argument("--once", action="store_true", help="지금 폴더에 있는 파일만 처리하고 종료")
+
+    p = sub.add_parser("batch", help="JSON/CSV 작업 목록 실행")
+    p.add_argument("manifest")
+    p.add_argument("-j", "--jobs", type=int, default=1, help="동시에 실행할 작업 수")
+    return parser
+
+def print_stats():
+    mb = 1024 * 1024
+    print(f"{'단계':10s} {'횟수':>6s} {'합계(초)':>9s} {'최대(ms)':>9s} {'크기(MB)':>9s}", file=sys.stderr)
+    for r in tracer.summary():
+        print(f"{r['name']:10s} {r['count']:6d} {r['seconds']:9.2f} {r['max_seconds'] * 1000:9.1f} "
+              f"{r['bytes'] / mb:9.1f}", file=sys.stderr)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        tracer.configure(args.trace)
+    if args.poppler_path:
+        set_poppler_path(args.poppler_path)
+    try:
+        return run_command(args)
+    finally:
+        tracer.close()
+        if args.stats:
+            print_stats()
+
+def compare_renderers(pdf_paths, dpi, pages):
+    """ 문서마다 렌더러별 렌더링 시간을 출력하고 더 빠른 렌더러를 알려 준다 """
+    print(f"Poppler: {find_poppler_path() or ('PATH' if poppler_available() else '찾을 수 없음')}")
+    for pdf_path in pdf_paths:
+        print(pdf_path)
+        results = benchmark_renderers(pdf_path, dpi, pages)
+        for r in results:
+            if r["error"]:
+                print(f"  {r['renderer']:8s} 실패: {r['error']}")
+            else:
+                print(f"  {r['renderer']:8s} {r['pages']}페이지 한 번에 {r['batch_seconds']:.3f}초, "
+                      f"한 페이지씩 {r['single_seconds']:.3f}초")
+        ok = [r for r in results if not r["error"]]
+        if ok:
+            print(f"  -> 추천: --renderer {ok[0]['renderer']}")
+    return 0
+
+def watch_folders(args):
+    """ 감시 모드 실행. --config의 값이 기본이고 명령줄에서 지정한 옵션이 우선한다. """
+    pipeline = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            pipeline = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(args.config))
+        if "output" in pipeline:
+            pipeline["output"] = os.path.join(base_dir, pipeline["output"])
+    options = {"op": args.op, "output": args.output, "mode": args.mode, "ranges": args.ranges, "format": args.format,
+               "dpi": args.dpi}
+    pipeline.update({k: v for k, v in options.items() if v is not None})
+    pipeline.setdefault("op", "render")
+    if args.no_resume:
+        pipeline["resume"] = False
+
+    jobs = max(1, args.jobs)
+    render_workers = render_workers_per_job(jobs)
+    try:
+        hot = HotFolder(args.folders, pipeline, lambda job: run_job(job, render_workers), jobs, args.queue,
+                        args.settle, args.poll, args.batch_size, args.batch_seconds,
+                        log=lambda message: print(message, flush=True))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(f"감시 시작: {', '.join(hot.folders)} ({pipeline['op']} -> {pipeline['output']})", flush=True)
+    try:
+        throughput = hot.run(once=args.once)
+    except KeyboardInterrupt:
+        # 실행 중인 작업은 끝까지 기다린 뒤 종료 (ThreadPoolExecutor 종료 시 대기)
+        print("감시를 멈췄습니다.", file=sys.stderr)
+        return 130
+    return 1 if throughput.failed else 0
+
+def run_command(args):
+    if args.command == "batch":
+        jobs = load_manifest(args.manifest)
+        if args.no_resume:
+            for job in jobs:
+                job["resume"] = False
+        return 1 if run_batch(jobs, args.jobs) else 0
+    if args.command == "renderers":
+        return compare_renderers(args.inputs, args.dpi, args.pages)
+    if args.command == "watch":
+        return watch_folders(args)
+
+    job = {"op": args.command, "inputs": args.inputs, "output": args.output, "resume": not args.no_resume}
+    if args.command == "merge":
+        job.update(max_open=args.max_open, optimize=args.optimize, recompress=args.recompress)
+    elif args.command == "split":
+        job.update(mode=args.mode, ranges=args.ranges)
+    elif args.command == "render":
+        job.update(format=args.format, dpi=args.dpi, memory_limit_mb=args.memory_limit, workers=args.workers,
+                   jpeg_quality=args.jpeg_quality, png_level=args.png_level, multipage_tiff=args.multipage_tiff,
+                   extract=args.extract, renderer=args.renderer)
+    return 1 if run_batch([job]) else 0
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()  # PyInstaller 실행 파일에서 분할 작업자 프로세스 지원
+    sys.exit(main())
@@ -0,0 +1,905 @@
+import sys
+import os
+import multiprocessing
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import namedtuple, Counter
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from tracing import span, record, bind
+from pdfinput import open_reader, map_file, mapped_merger, forget as forget_input
+from renderers import (
+    RENDERERS, DEFAULT_RENDERER, resource_path, largest_page_size, find_poppler_path, poppler_available, get_renderer,
+    available_renderers
+)
+
+# GUI(PySide6)와 무관한 PDF 처리 엔진. 데스크톱 앱(pdfmanager.py)과 명령줄 도구(pdfcli.py)가 함께 사용한다.
+# PyPDF2, pdf2image(pypdfium2)는 실행 시작 시간을 줄이기 위해 실제로 필요한 함수 안에서 불러온다.
+# 원본 PDF는 pdfinput.py를 통해 mmap으로 열고, 파싱된 PdfReader는 작업 간에 공유한다.
+
+APP_NAME = "PDFManager"    # 프로그램 이름 
+VERSION = "1.0.0"   # 버전 정보
+
+RENDER_MEMORY_LIMIT_MB = 256    # 이미지 저장 시 한 번에 메모리에 올릴 렌더링 결과의 최대 크기
+RENDER_WORKERS = os.cpu_count() or 1    # 이미지 저장 시 동시에 실행할 렌더링 작업 수
+
+JPEG_QUALITY = 75       # JPEG 품질 기본값 (1~95)
+PNG_COMPRESS_LEVEL = 6  # PNG 압축 수준 기본값 (0~9, pdftoppm과 PIL의 기본값)
+# pdftoppm이 직접 쓸 수 있는 포맷 (PIL 저장 포맷 -> pdf2image fmt)
+DIRECT_FORMATS = {"PNG": "png", "JPEG": "jpeg", "TIFF": "tiff"}
+
+# 확장자 -> (PIL 저장 포맷, 파일 확장자)
+IMAGE_FORMATS = {
+    "png": ("PNG", "png"),
+    "jpg": ("JPEG", "jpg"),
+    "jpeg": ("JPEG", "jpg"),
+    "bmp": ("BMP", "bmp"),
+    "tif": ("TIFF", "tiff"),
+    "tiff": ("TIFF", "tiff"),
+}
+
+# 원본 이미지 추출 (pdfimages): 그대로 꺼내면 일반 이미지 파일이 되는 인코딩만 사용 (CCITT/JBIG2 제외)
+EXTRACT_ENCODINGS = ("jpeg", "jpx", "image")
+EXTRACT_CHUNK_PAGES = 64        # pdfimages 한 번에 처리할 최대 페이지 수
+EXTRACT_FIT_TOLERANCE = 0.03    # 이미지가 페이지 전체를 덮는다고 볼 크기 오차 비율
+EXTRACT_NAME_RE = re.compile(r"-(\d+)-\d+\.(\w+)$")   # pdfimages -p 출력 파일명: prefix-페이지-번호.확장자
+
+MERGE_MAX_OPEN = 64     # 합치기 시 한 번에 열어 둘 최대 입력 파일 수 (넘으면 임시 파일로 나눠 합침)
+
+SPLIT_OPTIONS = ("all", "range_each", "range_group", "range_merge")
+SPLIT_WORKERS = os.cpu_count() or 1     # 분할 파일을 동시에 기록할 프로세스 수
+SPLIT_PARALLEL_MIN_PAGES = 64   # 이보다 적은 페이지는 프로세스를 띄우지 않고 현재 프로세스에서 분할
+
+# 페이지 간에 공유되는 리소스 종류 및 내용 스트림의 이름 토큰
+RESOURCE_CATEGORIES = ("/Font", "/XObject", "/ColorSpace", "/ExtGState", "/Pattern", "/Shading", "/Properties")
+CONTENT_NAME_RE = re.compile(rb"/([^\s/\[\]()<>{}%]+)")
+
+EncodeOptions = namedtuple("EncodeOptions", "jpeg_quality png_compress_level multipage_tiff",
+                           defaults=(JPEG_QUALITY, PNG_COMPRESS_LEVEL, False))
+MergeResult = namedtuple("MergeResult", "path input_count peak_rss_bytes size_before size_after write_seconds")
+
+
+class JobCancelled(Exception):
+    """ 사용자가 작업을 취소했을 때 발생 """
+
+class PageRangeError(ValueError):
+    """ 페이지 범위 입력이 잘못되었을 때 발생 """
+
+def warm_up():
+    """ PDF/렌더링 라이브러리를 미리 불러온다. 창을 띄운 뒤 백그라운드에서 호출하면 첫 작업의 지연이 줄어든다.
+        렌더러는 사용할 수 있는 것을 모두 불러온다 (auto가 고르는 것 외에 화면에서 다른 렌더러를 고를 수 있음). """
+    import PyPDF2.generic  # noqa: F401
+    for name in available_renderers():
+        get_renderer(name).warm_up()
+
+def check_cancel(cancel):
+    # cancel: threading.Event 등 is_set()을 가진 객체 (None이면 취소 불가)
+    if cancel is not None and cancel.is_set():
+        raise JobCancelled()
+
+def report(progress, done, total):
+    # progress: (완료 수, 전체 수)를 받는 콜백 (None이면 무시)
+    if progress is not None:
+        progress(done, total)
+
+@contextmanager
+def atomic_path(path):
+    """ path 대신 같은 폴더의 임시 파일 경로를 주고, 블록이 끝나면 path로 바꾼다 (os.replace).
+        도중에 실패하거나 취소되면 임시 파일만 지워지므로 반쯤 기록된 파일이 남지 않는다. """
+    folder, name = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(folder, f".{name}.{os.getpid()}_{threading.get_ident()}.part")
+    try:
+        yield tmp_path
+        forget_input(path)  # 덮어쓸 파일이 입력 캐시에 매핑되어 있으면 먼저 닫는다 (Windows)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def journal_done(journal, key, paths):
+    # journal(journal.JobJournal)이 있으면 key의 출력이 완료되었음을 기록
+    if journal is not None:
+        journal.done(key, paths)
+
+def parse_page_ranges(page_range, page_count):
+    """ "1-3,5" 형식의 페이지 범위를 [(범위 문자열, [0부터 시작하는 페이지 번호, ...]), ...]로 변환 """
+    ranges = []
+    for r in page_range.split(","):
+        r = r.strip()
+        if "-" in r:
+            try:
+                start, end = map(int, r.split("-"))
+            except ValueError:
+                raise PageRangeError("페이지 범위는 정수로 입력하세요.")
+            if start < 1 or end > page_count or start > end:
+                raise PageRangeError(f"페이지 범위는 1~{page_count} 사이의 올바른 값이어야 합니다.")
+            ranges.append((r, list(range(start - 1, end))))
+        else:
+            try:
+                i = int(r) - 1
+            except ValueError:
+                raise PageRangeError("페이지 번호는 정수로 입력하세요.")
+            if i < 0 or i >= page_count:
+                raise PageRangeError(f"페이지 번호는 1~{page_count} 사이여야 합니다.")
+            ranges.append((r, [i]))
+    return ranges
+
+def current_rss_bytes():
+    """ 현재 프로세스의 실제 메모리 사용량(RSS, 바이트) """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
+class MemoryMonitor:
+    """ with 블록 동안 프로세스 RSS를 주기적으로 측정해 최대값(peak)을 기록한다.
+        같은 프로세스에서 동시에 실행 중인 다른 작업의 메모리도 함께 측정된다. """
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def sample(self):
+        self.peak = max(self.peak, current_rss_bytes())
+
+    def watch(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self.thread = threading.Thread(target=self.watch, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        self.sample()
+        return False
+
+def flatten_outline(reader, items, level=0):
+    """ PyPDF2의 중첩 목차를 [(단계, 제목, 1부터 시작하는 페이지 번호 또는 None), ...]로 변환 """
+    result = []
+    for item in items:
+        if isinstance(item, list):
+            result.extend(flatten_outline(reader, item, level + 1))
+            continue
+        try:
+            page = reader.get_destination_page_number(item) + 1
+        except Exception:
+            page = None
+        result.append((level, str(item.title), page))
+    return result
+
+def add_outline(merger, outline):
+    """ flatten_outline 형식의 목차를 merger에 추가 """
+    parents = []
+    for level, title, page in outline:
+        if page is None:
+            continue
+        del parents[level:]
+        item = merger.add_outline_item(title, page - 1, parents[-1] if parents else None)
+        parents.append(item)
+
+def merge_group(pdf_paths, save_path, on_append=None, cancel=None, outline=None, collect=None, page_offset=0):
+    """ pdf_paths 순서대로 하나의 PDF로 합쳐 save_path에 저장하고 (페이지 수, 기록에 걸린 초)를 반환한다.
+        outline과 collect가 모두 None이면 원본 목차를 그대로 가져온다.
+        collect(list)가 주어지면 원본 목차를 page_offset만큼 밀어 collect에 모으고 파일에는 넣지 않는다.
+        outline이 주어지면 원본 목차 대신 outline으로 목차를 만든다. """
+    import_outline = outline is None and collect is None
+    merger = mapped_merger()
+    try:
+        for path in pdf_paths:
+            check_cancel(cancel)
+            with span("open", path=path, bytes=os.path.getsize(path)):
+                merger.append(path, import_outline=import_outline)
+            if collect is not None:
+                reader = merger.inputs[-1][1]
+                collect.extend((level, title, None if page is None else page + page_offset)
+                               for level, title, page in flatten_outline(reader, reader.outline))
+                page_offset += len(reader.pages)
+            if on_append is not None:
+                on_append()
+        if outline is not None:
+            add_outline(merger, outline)
+        check_cancel(cancel)
+        start = time.perf_counter()
+        with span("write", path=save_path, pages=len(merger.pages)) as s, atomic_path(save_path) as tmp_path:
+            merger.write(tmp_path)
+            s["bytes"] = os.path.getsize(tmp_path)
+        return len(merger.pages), time.perf_counter() - start
+    finally:
+        merger.close()
+
+def merge_levels(count, max_open):
+    """ 단계별 합치기 대상 수. 예) 1000개, max_open 64 -> [1000, 16] """
+    levels = [count]
+    while levels[-1] > max_open:
+        levels.append(-(-levels[-1] // max_open))
+    return levels
+
+def merge_pdf_files(pdf_paths, save_path, progress=None, cancel=None, max_open=MERGE_MAX_OPEN,
+                    optimize=False, recompress=False, journal=None):
+    """ pdf_paths 순서대로 하나의 PDF로 합쳐 save_path에 저장한다.
+        입력이 max_open개를 넘으면 max_open개씩 임시 파일로 먼저 합치고, 그 결과를 다시 합친다.
+        그래서 동시에 메모리에 올라가는 입력 파일 수가 max_open개를 넘지 않는다. 목록 순서와 목차는 유지된다.
+        optimize가 True이면 같은 내용의 폰트/이미지 등을 하나로 합치고, recompress이면 압축되지 않은 스트림도 압축한다.
+        journal에 같은 작업으로 만든 save_path가 그대로 남아 있다고 기록되어 있으면 다시 합치지 않는다. """
+    if journal is not None and journal.is_done(save_path):
+        size = os.path.getsize(save_path)
+        report(progress, 1, 1)
+        return MergeResult(save_path, len(pdf_paths), 0, size, size, 0.0)
+    max_open = max(2, int(max_open))
+    total = sum(merge_levels(len(pdf_paths), max_open))
+    done = [0]
+
+    def on_append():
+        done[0] += 1
+        report(progress, done[0], total)
+
+    out_dir = os.path.dirname(os.path.abspath(save_path))
+    merged_path = save_path
+    if optimize:
+        fd, merged_path = tempfile.mkstemp(prefix=f"{APP_NAME}_merge_", suffix=".pdf", dir=out_dir)
+        os.close(fd)
+
+    with MemoryMonitor() as memory, span("merge", inputs=len(pdf_paths), optimize=optimize):
+        try:
+            level = list(pdf_paths)
+            if len(level) <= max_open:
+                _, write_seconds = merge_group(level, merged_path, on_append, cancel)
+            else:
+                # 중간 파일을 거치면 목차가 유지되지 않으므로 첫 단계에서 원본 목차를 모아 마지막 파일에 다시 만든다
+                tmp_dir = tempfile.mkdtemp(prefix=f"{APP_NAME}_merge_", dir=out_dir)
+                try:
+                    outline = []
+                    page_offset = 0
+                    n = 0
+                    first_level = True
+                    while len(level) > max_open:
+                        next_level = []
+                        for i in range(0, len(level), max_open):
+                            group = level[i:i + max_open]
+                            out_path = os.path.join(tmp_dir, f"part_{n:06d}.pdf")
+                            n += 1
+                            if first_level:
+                                pages, _ = merge_group(group, out_path, on_append, cancel,
+                                                       collect=outline, page_offset=page_offset)
+                                page_offset += pages
+                            else:
+                                merge_group(group, out_path, on_append, cancel, outline=[])
+                            for path in group:
+                                if os.path.dirname(path) == tmp_dir:
+                                    os.remove(path)  # 다음 단계에 합쳐진 중간 파일은 바로 삭제
+                            next_level.append(out_path)
+                        level = next_level
+                        first_level = False
+                    _, write_seconds = merge_group(level, merged_path, on_append, cancel, outline=outline)
+                finally:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            if optimize:
+                from pdfoptimize import optimize_pdf
+                check_cancel(cancel)
+                with span("optimize", path=save_path) as s:
+                    result = optimize_pdf(merged_path, save_path, recompress)
+                    s["bytes"] = result.size_after
+                size_before, size_after = result.size_before, result.size_after
+                write_seconds += result.write_seconds
+            else:
+                size_before = size_after = os.path.getsize(save_path)
+        finally:
+            if merged_path != save_path and os.path.exists(merged_path):
+                os.remove(merged_path)
+    journal_done(journal, save_path, [save_path])
+    return MergeResult(save_path, len(pdf_paths), memory.peak, size_before, size_after, write_seconds)
+
+def plan_split(pdf_path, folder, option, page_range, page_count):
+    """ 분할 결과 파일 목록 [(저장 경로, [0부터 시작하는 페이지 번호, ...]), ...]을 만든다.
+        option: "all"(전체 페이지 분할), "range_each"(범위의 페이지별로 저장),
+                "range_group"(범위마다 한 파일로 저장), "range_merge"(범위 전체를 한 파일로 저장) """
+    name = os.path.basename(pdf_path)
+    if option == "all":
+        return [(os.path.join(folder, f"{name}_p{i+1}.pdf"), [i]) for i in range(page_count)]
+
+    ranges = parse_page_ranges(page_range or "", page_count)
+    if option == "range_each":
+        return [(os.path.join(folder, f"{APP_NAME}_result_{name}_p{i+1}.pdf"), [i])
+                for _, pages in ranges for i in pages]
+    elif option == "range_group":
+        return [(os.path.join(folder, f"{APP_NAME}_result_{name}_split_{r}.pdf"), pages)
+                for r, pages in ranges]
+    elif option == "range_merge":
+        text_range = "_".join(r for r, _ in ranges)
+        return [(os.path.join(folder, f"{APP_NAME}_result_{name}_split_{text_range}.pdf"),
+                 [i for _, pages in ranges for i in pages])]
+    raise ValueError(f"알 수 없는 분할 옵션: {option}")
+
+def page_resource_refs(page):
+    """ 페이지 /Resources가 참조하는 공유 객체(폰트, 이미지, 색 프로필 등) 번호 집합. 내용 스트림은 읽지 않는다. """
+    from PyPDF2.generic import DictionaryObject, IndirectObject
+    res = page.get("/Resources")
+    if res is None:
+        return frozenset()
+    res = res.get_object()
+    refs = set()
+    for category in RESOURCE_CATEGORIES:
+        entries = res.get(category)
+        if isinstance(entries, IndirectObject):
+            refs.add(entries.idnum)
+            entries = entries.get_object()
+        if isinstance(entries, DictionaryObject):
+            refs.update(v.idnum for v in entries.values() if isinstance(v, IndirectObject))
+    return frozenset(refs)
+
+def page_used_names(page):
+    """ 페이지 내용 스트림에 나오는 이름(/F1, /Im0 등) 집합. 해석할 수 없으면 None """
+    contents = page.get_contents()
+    if contents is None:
+        return set()
+    names = {m.decode("latin-1") for m in CONTENT_NAME_RE.findall(contents.get_data())}
+    if any("#" in n for n in names):
+        return None  # 이스케이프된 이름은 비교하지 않고 리소스를 그대로 둔다
+    return names
+
+def inherits_page_resources(entry, category):
+    """ /Resources가 없어 페이지의 리소스를 그대로 쓰는 Form XObject 또는 Type3 글꼴인지
+        (이런 객체의 내용 스트림이 쓰는 이름은 페이지 내용 스트림에 나오지 않는다) """
+    obj = entry.get_object()
+    if not hasattr(obj, "get") or "/Resources" in obj:
+        return False
+    if category == "/XObject":
+        return obj.get("/Subtype") == "/Form"
+    if category == "/Font":
+        return obj.get("/Subtype") == "/Type3"
+    return False
+
+def shared_resource_ids(reader):
+    """ 두 페이지 이상이 함께 쓰는 /Resources 객체의 id 집합 (부모 노드에서 상속되거나 같은 간접 참조).
+        PdfReader는 해석한 간접 객체를 캐시하므로 같은 객체를 쓰는 페이지는 같은 id를 가진다. """
+    counts = Counter()
+    for page in reader.pages:
+        res = page.get("/Resources")
+        if res is not None:
+            counts[id(res.get_object())] += 1
+    return {key for key, count in counts.items() if count > 1}
+
+def pruned_resources(page):
+    """ 문서 전체가 하나의 /Resources를 공유하는 경우, 페이지가 쓰지 않는 폰트/이미지까지
+        분할된 파일마다 복사되지 않도록 내용 스트림에서 실제로 쓰는 항목만 남긴 새 /Resources.
+        줄일 수 없으면 (이름을 해석할 수 없거나, 쓰는 Form XObject/Type3 글꼴이 페이지 리소스를 물려받으면) None """
+    from PyPDF2.generic import DictionaryObject, NameObject
+    res = page.get("/Resources")
+    if res is None:
+        return None
+    names = page_used_names(page)
+    if names is None:
+        return None
+    res = res.get_object()
+    pruned = DictionaryObject(res)
+    for category in RESOURCE_CATEGORIES:
+        entries = res.get(category)
+        if entries is None:
+            continue
+        entries = entries.get_object()
+        if isinstance(entries, DictionaryObject):
+            used = {k: v for k, v in entries.items() if k[1:] in names}
+            if any(inherits_page_resources(v, category) for v in used.values()):
+                return None
+            pruned[NameObject(category)] = DictionaryObject(used)
+    return pruned
+
+def pruned_page(page, shared):
+    """ /Resources만 줄인 페이지의 얕은 복사본. 원본 페이지(입력 캐시에서 공유하는 PdfReader의 객체)는 바꾸지 않는다.
+        /Resources가 shared(shared_resource_ids)에 없으면 페이지 전용이므로 줄이지 않고 그대로 반환한다. """
+    from PyPDF2 import PageObject
+    from PyPDF2.generic import NameObject
+    res = page.get("/Resources")
+    if res is None or id(res.get_object()) not in shared:
+        return page
+    resources = pruned_resources(page)
+    if resources is None:
+        return page
+    copy = PageObject(page.pdf, page.indirect_reference)
+    copy.update(page)
+    copy[NameObject("/Resources")] = resources
+    return copy
+
+def write_split_output(reader, out_path, pages, shared=None):
+    """ pages를 하나의 파일로 저장. 같은 파일 안에서는 공유 객체가 한 번만 기록된다.
+        shared: shared_resource_ids(reader) (여러 파일을 저장할 때 한 번만 계산해 넘김) """
+    from PyPDF2 import PdfWriter
+    if shared is None:
+        shared = shared_resource_ids(reader)
+    writer = PdfWriter()
+    for i in pages:
+        writer.add_page(pruned_page(reader.pages[i], shared))
+    with atomic_path(out_path) as tmp_path, open(tmp_path, "wb") as f:
+        writer.write(f)
+    return len(pages)
+
+def group_split_outputs(outputs, page_refs, task_count):
+    """ 같은 공유 객체를 참조하는 출력끼리 정렬해 task_count개의 연속 묶음으로 나눈다.
+        작업자 프로세스는 묶음 안에서 공유 객체를 한 번만 읽고 재사용한다. """
+    def signature(output):
+        refs = set()
+        for i in output[1]:
+            refs |= page_refs[i]
+        return tuple(sorted(refs))
+    ordered = sorted(outputs, key=signature)
+    size = max(1, -(-len(ordered) // max(1, task_count)))
+    return [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+_split_reader = None    # 작업자 프로세스마다 한 번만 여는 원본 PDF
+_split_shared = None    # 그 PDF의 shared_resource_ids
+
+def _split_worker_init(pdf_path):
+    global _split_reader, _split_shared
+    from PyPDF2 import PdfReader
+    _split_reader = PdfReader(map_file(pdf_path))
+    _split_shared = shared_resource_ids(_split_reader)
+
+def _split_worker_write(outputs):
+    # 작업자 프로세스에서는 기록기를 쓸 수 없으므로 (경로, 페이지 수, 초, 바이트)를 돌려주고 부모가 기록한다
+    results = []
+    for out_path, pages in outputs:
+        start = time.perf_counter()
+        write_split_output(_split_reader, out_path, pages, _split_shared)
+        results.append((out_path, len(pages), time.perf_counter() - start, os.path.getsize(out_path)))
+    return results
+
+def split_pdf(pdf_path, folder, option, page_range=None, progress=None, cancel=None, workers=SPLIT_WORKERS,
+              journal=None):
+    """ 원본을 한 번만 파싱해 분할한다. 페이지가 많으면 공유 객체 기준으로 묶은 출력을
+        여러 작업자 프로세스(각각 원본을 한 번씩 엶)에서 동시에 기록한다.
+        범위는 저장을 시작하기 전에 모두 검사하므로 입력 오류 시 파일이 일부만 생기지 않는다.
+        journal이 있으면 이전 실행에서 이미 만들어 그대로 남아 있는 출력 파일은 다시 쓰지 않는다. """
+    with span("split", path=pdf_path, option=option), open_reader(pdf_path) as reader:
+        return _split_pdf(reader, pdf_path, folder, option, page_range, progress, cancel, workers, journal)
+
+def _split_pdf(reader, pdf_path, folder, option, page_range, progress, cancel, workers, journal):
+    outputs = plan_split(pdf_path, folder, option, page_range, len(reader.pages))
+    total = sum(len(pages) for _, pages in outputs)
+    pending = outputs
+    if journal is not None:
+        pending = [(out_path, pages) for out_path, pages in outputs if not journal.is_done(out_path)]
+    done = total - sum(len(pages) for _, pages in pending)
+    report(progress, done, total)
+
+    if workers > 1 and len(pending) > 1 and total - done >= SPLIT_PARALLEL_MIN_PAGES:
+        used = {i for _, pages in pending for i in pages}
+        page_refs = {i: page_resource_refs(reader.pages[i]) for i in used}
+        tasks = group_split_outputs(pending, page_refs, workers * 4)  # 진행률/취소 반응을 위해 작업자보다 잘게 나눔
+        # fork는 다른 스레드가 잡고 있던 잠금(입력 캐시 등)까지 복제해 작업자가 멈출 수 있으므로 spawn으로 띄운다
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_split_worker_init, initargs=(pdf_path,)) as pool:
+            futures = [pool.submit(_split_worker_write, task) for task in tasks]
+            try:
+                for future in as_completed(futures):
+                    for out_path, pages, seconds, size in future.result():
+                        record("write", seconds, path=out_path, pages=pages, bytes=size)
+                        journal_done(journal, out_path, [out_path])
+                        done += pages
+                    report(progress, done, total)
+                    check_cancel(cancel)
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+    else:
+        shared = shared_resource_ids(reader)
+        for out_path, pages in pending:
+            check_cancel(cancel)
+            with span("write", path=out_path, pages=len(pages)) as s:
+                done += write_split_output(reader, out_path, pages, shared)
+                s["bytes"] = os.path.getsize(out_path)
+            journal_done(journal, out_path, [out_path])
+            report(progress, done, total)
+    return [out_path for out_path, _ in outputs]
+
+def render_chunk_pages(page_size, dpi, memory_limit_mb=RENDER_MEMORY_LIMIT_MB):
+    """ 메모리 한도 안에서 한 번에 렌더링할 수 있는 페이지 수 계산 (RGB 3바이트/픽셀 기준) """
+    w_pt, h_pt = page_size
+    page_bytes = (w_pt / 72 * dpi) * (h_pt / 72 * dpi) * 3
+    return max(1, int(memory_limit_mb * 1024 * 1024 // max(page_bytes, 1)))
+
+def plan_render_shards(pdf_path, dpi, memory_limit_mb=RENDER_MEMORY_LIMIT_MB, workers=1, index=None,
+                       renderer=DEFAULT_RENDERER):
+    """ 문서를 (first, last) 페이지 구간(shard)으로 나눈다.
+        전체 메모리 한도를 워커 수로 나눠 구간 크기를 정하고, 워커 수보다 구간이 적지 않도록 자른다.
+        index(docindex.DocumentIndex)가 있으면 색인된 페이지 정보를 사용해 렌더러로 문서를 여는 과정을 생략한다. """
+    with span("open", path=pdf_path, indexed=index is not None):
+        doc = index.get(pdf_path) if index is not None else None
+        if doc is not None and doc.page_count:
+            page_count = doc.page_count
+            page_size = largest_page_size(doc.page_sizes)  # 가장 큰 페이지 기준
+        else:
+            page_count, page_size = get_renderer(renderer).info(pdf_path)
+    chunk = render_chunk_pages(page_size, dpi, memory_limit_mb / max(1, workers))
+    chunk = min(chunk, max(1, -(-page_count // max(1, workers))))
+    return [(first, min(first + chunk - 1, page_count)) for first in range(1, page_count + 1, chunk)]
+
+def encoder_save_args(img_format, encode):
+    """ PIL로 저장할 때 사용할 인코더 옵션 """
+    if img_format == "JPEG":
+        return {"quality": encode.jpeg_quality}
+    if img_format == "PNG":
+        return {"compress_level": encode.png_compress_level}
+    return {}
+
+def can_render_direct(img_format, encode):
+    """ pdftoppm이 최종 파일을 바로 쓸 수 있는지 (PNG는 압축 수준을 바꾸지 않은 경우에만) """
+    if img_format not in DIRECT_FORMATS:
+        return False
+    if img_format == "PNG" and encode.png_compress_level != PNG_COMPRESS_LEVEL:
+        return False
+    return not (img_format == "TIFF" and encode.multipage_tiff)
+
+def render_shard_direct(pdf_path, folder, img_format, ext, dpi, first, last, page_done=None, cancel=None,
+                        encode=EncodeOptions(), renderer=DEFAULT_RENDERER):
+    """ pdftoppm이 대상 폴더에 바로 PNG/JPEG/TIFF를 쓰게 한 뒤 이름만 바꾼다.
+        PIL로 다시 읽고 인코딩하는 과정이 없어서 페이지마다 복사/인코딩이 한 번씩 줄어든다. """
+    backend = get_renderer(renderer)
+    check_cancel(cancel)
+    base = os.path.splitext(os.path.basename(pdf_path))[0]
+    prefix = f".{APP_NAME}_{base}_{first}_{threading.get_ident()}"   # 작업 중 임시 파일 이름
+    jpegopt = None
+    if img_format == "JPEG":
+        jpegopt = {"quality": encode.jpeg_quality, "progressive": False, "optimize": False}
+    try:
+        # 렌더링과 인코딩, 저장을 pdftoppm이 한 번에 하므로 하나의 render 구간으로 기록
+        with span("render", path=pdf_path, first=first, last=last, format=img_format, direct=True) as s:
+            paths = backend.render_to_files(pdf_path, folder, first, last, dpi, DIRECT_FORMATS[img_format],
+                                            prefix, jpegopt)
+            s["bytes"] = sum(os.path.getsize(path) for path in paths)
+        saved = []
+        for i, tmp_path in enumerate(sorted(paths), start=first):
+            check_cancel(cancel)
+            img_path = os.path.join(folder, f"{base}_page{i}.{ext}")
+            os.replace(tmp_path, img_path)
+            saved.append(img_path)
+            if page_done is not None:
+                page_done(i, [img_path])
+        return saved
+    finally:
+        for name in os.listdir(folder):
+            if name.startswith(prefix):
+                os.remove(os.path.join(folder, name))
+
+def render_shard(pdf_path, folder, img_format, ext, dpi, first, last, page_done=None, cancel=None,
+                 encode=EncodeOptions(), renderer=DEFAULT_RENDERER):
+    """ 한 구간을 렌더링해 저장 후 메모리 해제. 파일명은 페이지 번호로 정해지므로 실행 순서와 무관하다.
+        page_done(페이지, [저장 경로])는 페이지 파일이 완성될 때마다 호출된다. """
+    backend = get_renderer(renderer)
+    if backend.direct and can_render_direct(img_format, encode):
+        return render_shard_direct(pdf_path, folder, img_format, ext, dpi, first, last, page_done, cancel, encode,
+                                   backend.name)
+
+    check_cancel(cancel)
+    with span("render", path=pdf_path, first=first, last=last, renderer=backend.name) as s:
+        images = backend.render(pdf_path, first, last, dpi)
+        s["bytes"] = sum(img.width * img.height * len(img.getbands()) for img in images)   # 비압축 크기
+    base = os.path.splitext(os.path.basename(pdf_path))[0]
+    save_args = encoder_save_args(img_format, encode)
+    saved = []
+    try:
+        for i, img in enumerate(images, start=first):
+            check_cancel(cancel)
+            img_path = os.path.join(folder, f"{base}_page{i}.{ext}")
+            with span("encode", path=pdf_path, page=i, format=img_format) as s, atomic_path(img_path) as tmp_path:
+                img.save(tmp_path, img_format, **save_args)
+                s["bytes"] = os.path.getsize(tmp_path)
+            saved.append(img_path)
+            if page_done is not None:
+                page_done(i, [img_path])
+    finally:
+        for img in images:
+            img.close()
+        del images
+    return saved
+
+def render_multipage_tiff(pdf_path, folder, dpi, shards, page_done=None, cancel=None, renderer=DEFAULT_RENDERER):
+    """ 모든 페이지를 하나의 TIFF 파일({base}.tiff)에 순서대로 추가한다.
+        구간 단위로 렌더링해 바로 기록하므로 메모리 사용량은 구간 크기만큼으로 유지된다. """
+    from PIL import TiffImagePlugin
+    backend = get_renderer(renderer)
+    base = os.path.splitext(os.path.basename(pdf_path))[0]
+    out_path = os.path.join(folder, f"{base}.tiff")
+    with atomic_path(out_path) as tmp_path, TiffImagePlugin.AppendingTiffWriter(tmp_path, new=True) as tf:
+        for first, last in shards:
+            check_cancel(cancel)
+            with span("render", path=pdf_path, first=first, last=last, renderer=backend.name) as s:
+                images = backend.render(pdf_path, first, last, dpi)
+                s["bytes"] = sum(img.width * img.height * len(img.getbands()) for img in images)
+            try:
+                for i, img in enumerate(images, start=first):
+                    check_cancel(cancel)
+                    with span("encode", path=pdf_path, page=i, format="TIFF") as s:
+                        offset = tf.tell()
+                        img.save(tf, "TIFF", compression="tiff_deflate")
+                        s["bytes"] = tf.tell() - offset
+                    tf.newFrame()
+                    if page_done is not None:
+                        page_done(i, None)  # 파일이 완성되기 전이므로 페이지 단위로는 기록하지 않음
+            finally:
+                for img in images:
+                    img.close()
+                del images
+    return [out_path]
+
+def poppler_tool(name):
+    """ Poppler 명령(pdfimages 등)의 경로. Poppler 폴더를 찾지 못했으면 PATH에서 찾는다. """
+    poppler_path = find_poppler_path()
+    return os.path.join(poppler_path, name) if poppler_path else name
+
+def run_poppler(name, *args):
+    """ Poppler 명령을 콘솔 창 없이 실행하고 표준 출력을 반환 """
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    proc = subprocess.run([poppler_tool(name), *map(str, args)], capture_output=True, **kwargs)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} 실패: {proc.stderr.decode(errors='replace').strip()}")
+    return proc.stdout.decode(errors="replace")
+
+def list_page_images(pdf_path):
+    """ pdfimages -list 결과를 {페이지: [이미지 정보, ...]}로 반환 """
+    pages = {}
+    for line in run_poppler("pdfimages", "-list", pdf_path).splitlines()[2:]:
+        fields = line.split()
+        if len(fields) < 14 or not fields[0].isdigit():
+            continue
+        pages.setdefault(int(fields[0]), []).append({
+            "type": fields[2], "width": int(fields[3]), "height": int(fields[4]), "enc": fields[8],
+            "x_ppi": float(fields[12]), "y_ppi": float(fields[13]),
+        })
+    return pages
+
+def image_fills_page(image, page_size):
+    """ 이미지의 출력 크기(픽셀 / ppi)가 페이지 크기와 같은지
+        (가로세로가 바뀐 경우는 이미지를 돌려 그린 것이므로 꺼내면 방향이 달라진다) """
+    if image["x_ppi"] <= 0 or image["y_ppi"] <= 0:
+        return False
+    w = image["width"] / image["x_ppi"] * 72
+    h = image["height"] / image["y_ppi"] * 72
+    pw, ph = page_size
+    return abs(w - pw) <= pw * EXTRACT_FIT_TOLERANCE and abs(h - ph) <= ph * EXTRACT_FIT_TOLERANCE
+
+def extractable_pages(page_images, page_sizes):
+    """ 페이지 전체가 이미지 하나로 되어 있어(스캔 문서) 렌더링 없이 꺼낼 수 있는 페이지 번호 집합 """
+    pages = set()
+    for page, page_size in enumerate(page_sizes, start=1):
+        images = page_images.get(page, [])
+        if len(images) == 1 and images[0]["type"] == "image" and images[0]["enc"] in EXTRACT_ENCODINGS \
+                and image_fills_page(images[0], page_size):
+            pages.add(page)
+    return pages
+
+def image_drawn_upright(page):
+    """ 페이지 내용 스트림이 이미지 XObject를 회전/뒤집기 없이 그리는지 (Do 시점의 변환 행렬 확인).
+        Form XObject 안에서 그리거나 내용 스트림을 해석할 수 없으면 False """
+    from PyPDF2.generic import ContentStream
+    try:
+        contents = page.get_contents()
+        if contents is None:
+            return False
+        xobjects = page["/Resources"].get_object()["/XObject"].get_object()
+        operations = ContentStream(contents, page.pdf).operations
+    except Exception:
+        return False
+    ctm = (1.0, 0.0, 0.0, 1.0)  # 변환 행렬의 회전/크기 부분 (a, b, c, d)
+    stack = []
+    drawn = False
+    for operands, operator in operations:
+        if operator == b"q":
+            stack.append(ctm)
+        elif operator == b"Q":
+            ctm = stack.pop() if stack else ctm
+        elif operator == b"cm" and len(operands) == 6:
+            a, b, c, d = (float(x) for x in operands[:4])
+            ctm = (a * ctm[0] + b * ctm[2], a * ctm[1] + b * ctm[3], c * ctm[0] + d * ctm[2], c * ctm[1] + d * ctm[3])
+        elif operator == b"Do":
+            xobject = xobjects.get(operands[0]) if operands else None
+            if xobject is None or xobject.get_object().get("/Subtype") != "/Image":
+                return False
+            a, b, c, d = ctm
+            if b or c or a <= 0 or d <= 0:
+                return False
+            drawn = True
+    return drawn
+
+def upright_image_pages(pdf_path, pages):
+    """ pages 중 /Rotate가 없고 이미지를 회전/뒤집기 없이 그리는 페이지.
+        pdfimages는 이미지를 저장된 방향 그대로 꺼내므로 나머지 페이지는 렌더링해야 화면과 같은 방향이 된다. """
+    if not pages:
+        return set()
+    with open_reader(pdf_path) as reader:
+        try:
+            if reader.is_encrypted and not reader.decrypt(""):
+                return set()
+        except Exception:
+            return set()
+        return {page for page in pages
+                if reader.pages[page - 1].rotation % 360 == 0 and image_drawn_upright(reader.pages[page - 1])}
+
+def page_runs(pages, kind, chunk):
+    """ 페이지 번호 목록을 chunk 이하 길이의 연속 구간 (kind, first, last) 목록으로 묶는다 """
+    runs = []
+    for page in sorted(pages):
+        if runs and runs[-1][2] == page - 1 and page - runs[-1][1] < chunk:
+            runs[-1] = (kind, runs[-1][1], page)
+        else:
+            runs.append((kind, page, page))
+    return runs
+
+def plan_extract_tasks(pdf_path, dpi, memory_limit_mb=RENDER_MEMORY_LIMIT_MB, workers=1, index=None,
+                       renderer=DEFAULT_RENDERER):
+    """ 원본 이미지를 꺼낼 수 있는 페이지는 ("extract", first, last), 나머지는 ("render", first, last) 구간으로 나눈다.
+        pdfimages가 없으면(PDFium 렌더러만 사용하는 환경) 모든 페이지를 렌더링한다. """
+    with span("open", path=pdf_path, indexed=index is not None):
+        if index is not None:
+            doc = index.get(pdf_path)
+            page_sizes = doc.page_sizes if doc.page_count else None
+        else:
+            with open_reader(pdf_path) as reader:
+                page_sizes = None if reader.is_encrypted else \
+                    [(float(p.mediabox.width), float(p.mediabox.height)) for p in reader.pages]
+    if not page_sizes:
+        # 페이지 정보를 읽을 수 없으면 (암호화 등) 모두 렌더링
+        return [("render", first, last)
+                for first, last in plan_render_shards(pdf_path, dpi, memory_limit_mb, workers, renderer=renderer)]
+
+    extract = extractable_pages(list_page_images(pdf_path), page_sizes) if poppler_available() else set()
+    extract = upright_image_pages(pdf_path, extract)
+    render = set(range(1, len(page_sizes) + 1)) - extract
+    chunk = render_chunk_pages(largest_page_size(page_sizes), dpi, memory_limit_mb / max(1, workers))
+    chunk = min(chunk, max(1, -(-len(page_sizes) // max(1, workers))))
+    return page_runs(extract, "extract", EXTRACT_CHUNK_PAGES) + page_runs(render, "render", chunk)
+
+def extract_page_images(pdf_path, folder, first, last, page_done=None, cancel=None):
+    """ pdfimages로 페이지의 원본 이미지 스트림을 그대로 꺼내 {base}_page{i}.{원본 확장자}로 저장
+        (JPEG -> jpg, JPEG2000 -> jp2, 그 외 -> png). 다시 인코딩하지 않으므로 화질 손실이 없다. """
+    check_cancel(cancel)
+    base = os.path.splitext(os.path.basename(pdf_path))[0]
+    prefix = f".{APP_NAME}_{base}_x{first}_{threading.get_ident()}"   # 작업 중 임시 파일 이름
+    try:
+        with span("extract", path=pdf_path, first=first, last=last) as s:
+            run_poppler("pdfimages", "-all", "-p", "-f", first, "-l", last, pdf_path, os.path.join(folder, prefix))
+            s["bytes"] = sum(entry.stat().st_size for entry in os.scandir(folder) if entry.name.startswith(prefix))
+        saved = []
+        for name in sorted(os.listdir(folder)):
+            match = EXTRACT_NAME_RE.search(name)
+            if not name.startswith(prefix + "-") or match is None:
+                continue
+            check_cancel(cancel)
+            page = int(match.group(1))
+            img_path = os.path.join(folder, f"{base}_page{page}.{match.group(2)}")
+            os.replace(os.path.join(folder, name), img_path)
+            saved.append(img_path)
+            if page_done is not None:
+                page_done(page, [img_path])
+        return saved
+    finally:
+        for name in os.listdir(folder):
+            if name.startswith(prefix):
+                os.remove(os.path.join(folder, name))
+
+def page_key(pdf_path, page):
+    # 이미지 저장 작업 기록의 완료 단위: 문서의 한 페이지 (여러 페이지 TIFF는 page="tiff"로 문서 전체)
+    return f"{os.path.abspath(pdf_path)}#{page}"
+
+def pending_tasks(pdf_path, doc_tasks, journal, multipage=False):
+    """ (kind, first, last) 구간 목록에서 journal에 완료로 기록된 페이지를 뺀다.
+        남은 페이지는 원래 구간 안에서 다시 연속 구간으로 묶으므로 구간 크기(메모리 한도)는 그대로다. """
+    if multipage:
+        return [] if journal.is_done(page_key(pdf_path, "tiff")) else doc_tasks
+    pending = []
+    for kind, first, last in doc_tasks:
+        pages = [page for page in range(first, last + 1) if not journal.is_done(page_key(pdf_path, page))]
+        pending.extend(page_runs(pages, kind, last - first + 1))
+    return pending
+
+def render_pdfs_to_images(pdf_paths, folder, img_format, ext, dpi,
+                          memory_limit_mb=RENDER_MEMORY_LIMIT_MB, workers=RENDER_WORKERS,
+                          progress=None, cancel=None, index=None, encode=EncodeOptions(), extract=False,
+                          renderer=DEFAULT_RENDERER, journal=None):
+    """ 여러 PDF를 페이지 구간 단위로 나눠 스레드 풀에서 동시에 렌더링한다.
+        poppler 렌더러는 pdftoppm 프로세스가 렌더링하므로 스레드만으로 여러 코어를 사용할 수 있다.
+        renderer: "auto", "poppler", "pdfium" (renderers.py 참고)
+        여러 페이지 TIFF는 한 파일에 순서대로 써야 하므로 문서 단위로만 동시에 실행한다.
+        extract=True이면 스캔 페이지처럼 원본 이미지 하나로 된 페이지는 렌더링 없이 꺼내고,
+        나머지 페이지만 렌더링한다 (이때 여러 페이지 TIFF 옵션은 사용하지 않음).
+        journal이 있으면 완성된 페이지 파일(여러 페이지 TIFF는 문서 파일)을 기록하고,
+        이전 실행에서 만들어 그대로 남아 있는 페이지는 다시 렌더링하지 않는다.
+        반환값: {pdf_path: 예외 또는 None} """
+    workers = max(1, int(workers))
+    renderer = get_renderer(renderer).name   # auto는 작업 시작 시 한 번만 정한다
+    errors = {pdf_path: None for pdf_path in pdf_paths}
+    lock = threading.Lock()
+    done = [0]
+    multipage = img_format == "TIFF" and encode.multipage_tiff and not extract
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if extract:
+            plans = {pdf_path: pool.submit(bind(plan_extract_tasks), pdf_path, dpi, memory_limit_mb, workers, index,
+                                           renderer)
+                     for pdf_path in pdf_paths}
+        else:
+            plans = {pdf_path: pool.submit(bind(plan_render_shards), pdf_path, dpi, memory_limit_mb, workers, index,
+                                           renderer)
+                     for pdf_path in pdf_paths}
+        tasks = {}
+        for pdf_path, plan in plans.items():
+            try:
+                tasks[pdf_path] = plan.result() if extract else [("render",) + shard for shard in plan.result()]
+            except Exception as e:
+                errors[pdf_path] = e
+        total = sum(last - first + 1 for doc_tasks in tasks.values() for _, first, last in doc_tasks)
+        if journal is not None:
+            for pdf_path, doc_tasks in tasks.items():
+                tasks[pdf_path] = pending_tasks(pdf_path, doc_tasks, journal, multipage)
+            done[0] = total - sum(last - first + 1 for doc_tasks in tasks.values() for _, first, last in doc_tasks)
+            report(progress, done[0], total)
+
+        def page_done(pdf_path, page, paths):
+            if paths is not None:
+                journal_done(journal, page_key(pdf_path, page), paths)
+            with lock:
+                done[0] += 1
+                report(progress, done[0], total)
+
+        futures = {}
+        for pdf_path, doc_tasks in tasks.items():
+            doc_page_done = partial(page_done, pdf_path)
+            if multipage:
+                if not doc_tasks:
+                    continue
+                shards = [(first, last) for _, first, last in doc_tasks]
+                future = pool.submit(bind(render_multipage_tiff), pdf_path, folder, dpi, shards, doc_page_done, cancel,
+                                     renderer)
+                futures[future] = pdf_path
+                continue
+            for kind, first, last in doc_tasks:
+                if kind == "extract":
+                    future = pool.submit(bind(extract_page_images), pdf_path, folder, first, last, doc_page_done,
+                                         cancel)
+                else:
+                    future = pool.submit(bind(render_shard), pdf_path, folder, img_format, ext, dpi, first, last,
+                                         doc_page_done, cancel, encode, renderer)
+                futures[future] = pdf_path
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                saved = future.result()
+                if multipage:
+                    journal_done(journal, page_key(pdf_path, "tiff"), saved)
+            except JobCancelled:
+                pass
+            except Exception as e:
+                if errors[pdf_path] is None:
+                    errors[pdf_path] = e
+    check_cancel(cancel)
+    return errors
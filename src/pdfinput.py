@@ -0,0 +1,119 @@
+import os
+import io
+import mmap
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from tracing import span
+
+# 원본 PDF 입력 계층. 합치기/분할/이미지 저장/색인이 모두 이 모듈로 원본을 연다.
+# - 파일은 읽기 전용 mmap으로 열어 PyPDF2에 넘긴다. PdfReader에 경로를 주면 파일 전체를 BytesIO로 복사하고,
+#   PdfMerger에 경로를 주면 버퍼 없는 FileIO로 몇 바이트씩 읽는데, mmap은 필요한 부분만 페이지 캐시에서 바로 읽는다.
+# - 파싱된 PdfReader는 (경로, 크기, 수정 시각) 기준으로 최근 INPUT_CACHE_SIZE개를 보관해,
+#   같은 파일을 분할한 뒤 다시 합치거나 이미지로 저장할 때 다시 읽고 파싱하지 않는다.
+# PdfReader는 스레드에 안전하지 않으므로 with open_reader(...) 블록 동안 한 스레드만 사용하고,
+# 다른 스레드가 사용 중인 파일은 별도로 한 번 더 연다.
+# Windows에서는 매핑된 파일을 지우거나 덮어쓸 수 없으므로, 그 전에 forget(경로)로 캐시에서 닫는다.
+
+INPUT_CACHE_SIZE = 4    # 보관할 파싱된 PdfReader 수
+
+
+def map_file(path):
+    """ 파일을 읽기 전용으로 메모리 매핑한 스트림 (read/seek/tell 지원, 빈 파일은 BytesIO) """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return io.BytesIO()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)   # 매핑은 파일을 닫아도 유지된다
+
+def source_key(path):
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return path, st.st_size, st.st_mtime_ns
+
+
+class InputCache:
+    """ 여러 스레드에서 함께 사용하는 파싱된 PdfReader LRU 캐시 """
+    def __init__(self, size=INPUT_CACHE_SIZE):
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()    # (경로, 크기, 수정 시각) -> (PdfReader, mmap)
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def reader(self, path, cache=True):
+        """ path의 PdfReader를 with 블록 동안 빌려 준다. 블록이 끝나면 캐시에 돌려놓는다 (cache=False이면 닫음). """
+        key = source_key(path)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            stale = [self.entries.pop(k) for k in list(self.entries) if k[0] == key[0]]  # 내용이 바뀐 파일
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        for old in stale:
+            close_entry(old)
+        if entry is None:
+            from PyPDF2 import PdfReader
+            with span("open", path=path, bytes=key[1], mapped=True):
+                stream = map_file(path)
+                try:
+                    entry = (PdfReader(stream), stream)
+                except BaseException:
+                    stream.close()
+                    raise
+        try:
+            yield entry[0]
+        finally:
+            evicted = [entry]
+            if cache and self.size > 0:
+                with self.lock:
+                    if key not in self.entries:     # 다른 스레드가 먼저 돌려놓았으면 이쪽을 닫음
+                        self.entries[key] = entry
+                        evicted = []
+                        while len(self.entries) > self.size:
+                            evicted.append(self.entries.popitem(last=False)[1])
+            for old in evicted:
+                close_entry(old)
+
+    def forget(self, path):
+        """ path의 캐시된 PdfReader를 닫는다 (사용 중인 것은 돌려놓을 때 캐시에 들어감) """
+        path = os.path.abspath(path)
+        with self.lock:
+            entries = [self.entries.pop(k) for k in list(self.entries) if k[0] == path]
+        for entry in entries:
+            close_entry(entry)
+
+    def clear(self):
+        with self.lock:
+            entries = list(self.entries.values())
+            self.entries.clear()
+        for entry in entries:
+            close_entry(entry)
+
+
+def close_entry(entry):
+    _, stream = entry
+    try:
+        stream.close()
+    except BufferError:
+        pass    # 아직 매핑을 참조하는 버퍼가 있으면 마지막 참조가 사라질 때 해제된다
+
+
+def mapped_merger():
+    """ 경로로 추가한 입력을 FileIO 대신 mmap으로 읽는 PdfMerger.
+        PdfMerger는 PdfReader나 파일 객체를 넘기면 내용 전체를 BytesIO로 복사하므로 경로 입력의 스트림만 바꾼다. """
+    from PyPDF2 import PdfMerger
+
+    class MappedMerger(PdfMerger):
+        def _create_stream(self, fileobj):
+            if isinstance(fileobj, (str, os.PathLike)):
+                return map_file(fileobj), None
+            return super()._create_stream(fileobj)
+
+    return MappedMerger()
+
+
+input_cache = InputCache()
+open_reader = input_cache.reader
+forget = input_cache.forget
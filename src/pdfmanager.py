@@ -1,28 +1,46 @@
-import sys, pathlib
+import sys
 import os
+import json
+import time
+import sqlite3
+import threading
+import multiprocessing
 from PySide6.QtWidgets import (
     QApplication, QLabel, QWidget, QListWidget, QListWidgetItem, QPushButton, QFileDialog, QMessageBox,
     QVBoxLayout, QHBoxLayout, QGridLayout, QDialog, QRadioButton, QLineEdit, QDialogButtonBox, QButtonGroup,
-    QMainWindow, QMenuBar
+    QMainWindow, QMenuBar, QAbstractItemView, QSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QComboBox, QListView
+)
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import (
+    QUrl, QDir, Qt, QStandardPaths, QObject, QRunnable, QThreadPool, QTimer, QSize, Signal, QAbstractListModel,
+    QModelIndex, QMimeData
 )
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import QUrl, QDir, Qt, QStandardPaths
 from PySide6.QtGui import QFont, QAction, QDesktopServices
-from PyPDF2 import PdfMerger, PdfWriter, PdfReader
-from pdf2image import convert_from_path
+from pdfcore import (
+    APP_NAME, VERSION, RENDER_MEMORY_LIMIT_MB, RENDER_WORKERS, JPEG_QUALITY, PNG_COMPRESS_LEVEL, EncodeOptions,
+    DEFAULT_RENDERER, resource_path,
+    JobCancelled, PageRangeError, merge_pdf_files, split_pdf, render_pdfs_to_images, warm_up,
+    parse_page_ranges
+)
+from docindex import DocumentIndex, default_cache_dir
+from tracing import tracer, span, TRACE_FILE
+from journal import open_journal
+from renderers import available_renderers
+from thumbnails import ThumbnailCache, THUMBNAIL_SIZE, PREVIEW_SIZE
+from filelist import OrderedPaths, scan_pdf_paths
+from pdfinput import input_cache
 
 
-APP_NAME = "PDFManager"    # 프로그램 이름 
-VERSION = "1.0.0"   # 버전 정보
 home_dir = os.path.expanduser("~")  # 현재 사용자 홈 디렉토리
 default_dir = os.path.join(home_dir, "Downloads")
 
-# pyinstaller --onefile --windowed --add-data "C:\poppler-24.08.0\Library\bin;poppler" --add-data "C:\Users\saeby\Documents\pyqts\pdf\data;data" --icon "C:\Users\saeby\Documents\pyqts\pdf\data\app.ico" pdfmanager.py
+JOB_WORKERS = 4     # 동시에 실행할 합치기/분할/이미지 저장 작업 수
+THUMBNAIL_WORKERS = 2  # 미리보기 렌더링 스레드 수
+WARM_UP_DELAY_MS = 500  # 창이 뜬 뒤 PDF/렌더링 라이브러리를 미리 불러오기까지의 지연
+PROGRESS_INTERVAL = 0.1  # 작업 진행률을 GUI에 알리는 최소 간격(초) - 파일 수만 개를 처리할 때 이벤트가 쌓이지 않도록
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base_path, relative_path)
+# pyinstaller --onefile --windowed --add-data "..\poppler_bin;poppler_bin" --add-data "C:\Users\saeby\Documents\pyqts\pdf\data;data" --icon "C:\Users\saeby\Documents\pyqts\pdf\data\app.ico" pdfmanager.py
 
 def manual_url():
     # # 설치 폴더(실행 파일 기준) 또는 공용 데이터 경로에서 찾기
@@ -38,10 +56,290 @@ def manual_url():
     # 최후: 온라인 매뉴얼 URL
     return QUrl("https://github.com/SaeByeolMun/PDFManager/tree/main")
 
+def run_with_journal(func, *args, journal_spec, **kwargs):
+    """ 작업 스레드에서 작업 기록(journal_spec = open_journal 인자)을 연 뒤 func(*args, journal=기록, **kwargs)를 실행한다.
+        기록을 열 수 없으면 (입력 파일이 사라짐, 캐시 폴더를 쓸 수 없음 등) 기록 없이 실행하고,
+        입력 파일 오류는 func에서 다시 발생해 작업 실패로 표시된다. """
+    try:
+        journal = open_journal(*journal_spec)
+    except OSError as e:
+        print(f"작업 기록을 열 수 없어 기록 없이 실행합니다: {e}", file=sys.stderr)
+        journal = None
+    return func(*args, journal=journal, **kwargs)
+
+class JobSignals(QObject):
+    """ 작업 스레드에서 GUI 스레드로 상태를 전달하는 시그널 """
+    progress = Signal(int, int)     # (완료 수, 전체 수)
+    finished = Signal(object)       # 작업 함수의 반환값
+    failed = Signal(object)         # 발생한 예외
+    cancelled = Signal()
+
+class JobRunnable(QRunnable):
+    """ func(*args, progress=..., cancel=..., **kwargs)를 QThreadPool에서 실행한다.
+        cancel()을 호출하면 func가 다음 확인 지점에서 JobCancelled를 일으키고 멈춘다. """
+    def __init__(self, title, func, *args, **kwargs):
+        super().__init__()
+        self.title = title
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.cancel_event = threading.Event()
+        self.last_progress = 0.0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report_progress(self, done, total):
+        now = time.monotonic()
+        if done >= total or now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            with span("job", title=self.title):
+                result = self.func(*self.args, progress=self.report_progress,
+                                   cancel=self.cancel_event, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+class ThumbnailSignals(QObject):
+    ready = Signal(str, int, int, object)   # (경로, 페이지, 크기, PNG 바이트 또는 실패 시 None)
+
+class ThumbnailTask(QRunnable):
+    """ 미리보기 이미지를 캐시에서 찾거나 렌더링해 ready 시그널로 전달 """
+    def __init__(self, cache, signals, path, page, size):
+        super().__init__()
+        self.cache = cache
+        self.signals = signals
+        self.path = path
+        self.page = page
+        self.size = size
+
+    def run(self):
+        try:
+            data = self.cache.get(self.path, self.page, self.size)
+        except Exception:
+            data = None
+        self.signals.ready.emit(self.path, self.page, self.size, data)
+
+class PagePreviewDialog(QDialog):
+    """ 선택한 PDF의 페이지를 하나씩 미리보기 (페이지 이미지는 작업 스레드에서 준비) """
+    def __init__(self, manager, path, page_count):
+        super().__init__(manager)
+        self.manager = manager
+        self.path = path
+        self.setWindowTitle(f"미리보기 - {os.path.basename(path)}")
+
+        self.page_spin = QSpinBox()
+        self.page_spin.setRange(1, page_count)
+        self.page_spin.setPrefix("페이지 ")
+        self.page_spin.setSuffix(f" / {page_count}")
+        self.page_spin.valueChanged.connect(self.request_page)
+
+        self.image_label = QLabel("불러오는 중...")
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setFixedSize(PREVIEW_SIZE, PREVIEW_SIZE)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.page_spin)
+        layout.addWidget(self.image_label)
+        self.setLayout(layout)
+        self.request_page(1)
+
+    def request_page(self, page):
+        self.image_label.setText("불러오는 중...")
+        self.manager.request_thumbnail(self.path, page, PREVIEW_SIZE)
+
+    def show_page(self, page, data):
+        if page != self.page_spin.value():
+            return  # 이미 다른 페이지로 넘어감
+        pixmap = QPixmap()
+        if data is not None and pixmap.loadFromData(data):
+            self.image_label.setPixmap(pixmap)
+        else:
+            self.image_label.setText("미리보기를 만들 수 없습니다.")
+
+class TraceStatsDialog(QDialog):
+    """ 실행 이후 단계별(파일 열기, 렌더링, 인코딩, 저장 등) 소요 시간 합계 """
+    COLUMNS = ("단계", "횟수", "합계(초)", "평균(ms)", "최대(ms)", "크기(MB)", "MB/s", "오류")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("작업 통계")
+        self.resize(560, 320)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        self.path_label = QLabel(f"로그 파일: {tracer.path or '없음'}")
+        self.path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        refresh_button = QPushButton("새로고침")
+        refresh_button.clicked.connect(self.refresh)
+        reset_button = QPushButton("초기화")
+        reset_button.clicked.connect(self.reset)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addWidget(self.path_label)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        rows = tracer.summary()
+        self.table.setRowCount(len(rows))
+        mb = 1024 * 1024
+        for i, r in enumerate(rows):
+            values = (r["name"], str(r["count"]), f"{r['seconds']:.2f}",
+                      f"{r['seconds'] * 1000 / r['count']:.1f}", f"{r['max_seconds'] * 1000:.1f}",
+                      f"{r['bytes'] / mb:.1f}" if r["bytes"] else "-",
+                      f"{r['bytes'] / mb / r['seconds']:.1f}" if r["bytes"] and r["seconds"] else "-",
+                      str(r["errors"]))
+            for j, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if j > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(i, j, item)
+
+    def reset(self):
+        tracer.reset()
+        self.refresh()
+
+class PathBatchSignals(QObject):
+    batch = Signal(object)  # 폴더 검색 스레드에서 찾은 경로 목록
+
+class PdfListModel(QAbstractListModel):
+    """ 파일 목록 모델. 표시 이름은 파일명, 툴팁과 UserRole은 전체 경로.
+        미리보기 아이콘은 화면에 보이는 행을 처음 그릴 때 on_thumbnail_needed(경로)로 요청한다. """
+    ROWS_MIME = "application/x-pdfmanager-rows"    # 목록 안에서 끌어 옮기는 행 번호
+
+    def __init__(self, on_thumbnail_needed=None, parent=None):
+        super().__init__(parent)
+        self.paths = OrderedPaths()
+        self.icons = {}         # 경로 -> QIcon
+        self.requested = set()  # 미리보기를 요청한 경로
+        self.on_thumbnail_needed = on_thumbnail_needed
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.paths):
+            return None
+        path = self.paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(path)  # 파일명만 표시
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return path
+        if role == Qt.DecorationRole:
+            if path not in self.requested and self.on_thumbnail_needed is not None:
+                self.requested.add(path)
+                self.on_thumbnail_needed(path)
+            return self.icons.get(path)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled   # 항목 사이에만 놓을 수 있음
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [self.ROWS_MIME]
+
+    def mimeData(self, indexes):
+        mime = QMimeData()
+        mime.setData(self.ROWS_MIME, json.dumps(sorted({index.row() for index in indexes})).encode())
+        return mime
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if not data.hasFormat(self.ROWS_MIME):
+            return False
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self.paths)
+        self.move_rows(json.loads(bytes(data.data(self.ROWS_MIME)).decode()), row)
+        # 여기서 이미 옮겼으므로 False를 반환해 뷰가 원래 행을 다시 삭제하지 않게 한다
+        return False
+
+    def path(self, row):
+        return self.paths[row]
+
+    def all_paths(self):
+        return list(self.paths)
+
+    def add_paths(self, paths):
+        """ 목록에 없는 경로만 끝에 추가하고 추가된 경로 목록을 반환 """
+        new_paths = self.paths.new_paths(paths)
+        if new_paths:
+            start = len(self.paths)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_paths) - 1)
+            self.paths.extend(new_paths)
+            self.endInsertRows()
+        return new_paths
+
+    def remove_rows(self, rows):
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        if rows[-1] - rows[0] + 1 == len(rows):
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[-1])
+            removed = self.paths.remove_rows(rows)
+            self.endRemoveRows()
+        else:
+            # 떨어진 행이 여럿이면 구간마다 알리지 않고 한 번에 다시 구성
+            self.beginResetModel()
+            removed = self.paths.remove_rows(rows)
+            self.endResetModel()
+        for path in removed:
+            self.icons.pop(path, None)
+            self.requested.discard(path)
+            input_cache.forget(path)    # 목록에서 뺀 파일은 매핑을 닫아 다른 프로그램이 지울 수 있게 함
+
+    def move_rows(self, rows, dest):
+        """ rows를 dest 앞으로 옮긴다. 선택 등 유지되는 인덱스는 옮긴 위치를 따라간다. """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_paths = [self.paths[index.row()] for index in persistent]
+        self.paths.move_rows(rows, dest)
+        self.changePersistentIndexList(persistent,
+                                       [self.index(self.paths.row(path)) for path in persistent_paths])
+        self.layoutChanged.emit()
+
+    def set_icon(self, path, icon):
+        row = self.paths.row(path)
+        if row is not None:
+            self.icons[path] = icon
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self.paths.clear()
+        self.icons.clear()
+        self.requested.clear()
+        self.endResetModel()
+        input_cache.clear()
+
 class DragDropBox(QLabel):
     def __init__(self, on_pdf_dropped):
         super().__init__()
-        self.setText("여기에 PDF 파일을 드래그하세요")
+        self.setText("여기에 PDF 파일이나 폴더를 드래그하세요")
         self.setAlignment(Qt.AlignCenter)
         self.setStyleSheet("border: 2px dashed #aaa; font-size: 16px; padding: 20px;")
         self.setAcceptDrops(True)
@@ -50,7 +348,7 @@ class DragDropBox(QLabel):
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             urls = event.mimeData().urls()
-            if any(url.toLocalFile().lower().endswith(".pdf") for url in urls):
+            if any(is_pdf_or_folder(url.toLocalFile()) for url in urls):
                 event.acceptProposedAction()
             else:
                 event.ignore()
@@ -59,12 +357,15 @@ class DragDropBox(QLabel):
 
     def dropEvent(self, event):
         urls = event.mimeData().urls()
-        pdf_files = [url.toLocalFile() for url in urls if url.toLocalFile().lower().endswith(".pdf")]
+        pdf_files = [url.toLocalFile() for url in urls if is_pdf_or_folder(url.toLocalFile())]
 
         if pdf_files:
             self.on_pdf_dropped(pdf_files)
         else:
-            self.setText("PDF 파일이 아닙니다.")
+            self.setText("PDF 파일이나 폴더가 아닙니다.")
+
+def is_pdf_or_folder(path):
+    return path.lower().endswith(".pdf") or os.path.isdir(path)
 
 
 class PdfManager(QWidget):
@@ -74,9 +375,35 @@ class PdfManager(QWidget):
 
         window_ico = resource_path('data/app.ico')
         self.setWindowIcon(QIcon(window_ico))
-        self.setFixedSize(600, 400)
+        self.setFixedSize(600, 520)
 
-        self.pdf_file_paths = []  # 전체 경로 저장용
+        # 합치기/분할/이미지 저장은 GUI 스레드가 아닌 작업 스레드에서 실행
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(JOB_WORKERS)
+        self.jobs = {}  # JobRunnable -> 작업 목록의 QListWidgetItem
+
+        # 드롭된 PDF의 페이지 수 등을 저장해 두는 색인 (캐시 폴더를 쓸 수 없으면 메모리에만 보관)
+        try:
+            self.doc_index = DocumentIndex()
+        except (OSError, sqlite3.Error):
+            self.doc_index = DocumentIndex(":memory:")
+
+        # 파일 목록 미리보기 (메모리/디스크 캐시, 렌더링은 별도 스레드)
+        try:
+            self.thumbnail_cache = ThumbnailCache()
+        except OSError:
+            self.thumbnail_cache = None
+        self.thumbnail_pool = QThreadPool(self)
+        self.thumbnail_pool.setMaxThreadCount(THUMBNAIL_WORKERS)
+        self.thumbnail_signals = ThumbnailSignals()
+        self.thumbnail_signals.ready.connect(self.on_thumbnail_ready)
+        self.preview_dialog = None
+
+        # 단계별 소요 시간 기록 (로그 폴더를 쓸 수 없으면 통계 창용 합계만 메모리에 모음)
+        try:
+            tracer.configure(os.path.join(default_cache_dir(), "logs", TRACE_FILE))
+        except OSError:
+            pass
 
         # layout = QVBoxLayout()
         layout = QGridLayout()
@@ -84,6 +411,12 @@ class PdfManager(QWidget):
         menubar = QMenuBar(self)          # QWidget에는 menuBar() 없음
         layout.setMenuBar(menubar)        # 레이아웃에 메뉴바를 배치
         
+        tools_menu = menubar.addMenu("&Tools")
+        act_stats = QAction("작업 통계", self)
+        act_stats.triggered.connect(lambda: TraceStatsDialog(self).exec_())
+        act_stats.setToolTip("Job Statistics")
+        tools_menu.addAction(act_stats)
+
         help_menu = menubar.addMenu("&Help")
         help_menu.setToolTipsVisible(True) 
 
@@ -105,10 +438,19 @@ class PdfManager(QWidget):
         self.drag_drop_box = DragDropBox(self.handle_pdf_dropped)
         layout.addWidget(self.drag_drop_box, 0, 0, 1, 2)   # 0행 0~1열 전체
 
-        self.pdf_list_widget = QListWidget()
-        self.pdf_list_widget.setFont(QFont("Arial", 11))
-        self.pdf_list_widget.setDragDropMode(QListWidget.InternalMove)
-        layout.addWidget(self.pdf_list_widget, 1, 0, 6, 1)  # 1행 0열부터 2행 1열까지(세로로 2칸 차지)
+        # 파일 목록 (수만 개도 보이는 행만 그리도록 모델/뷰로 구성)
+        self.pdf_model = PdfListModel(lambda path: self.request_thumbnail(path, 1, THUMBNAIL_SIZE), self)
+        self.pdf_list_view = QListView()
+        self.pdf_list_view.setModel(self.pdf_model)
+        self.pdf_list_view.setFont(QFont("Arial", 11))
+        self.pdf_list_view.setUniformItemSizes(True)
+        self.pdf_list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.pdf_list_view.setDragDropMode(QAbstractItemView.InternalMove)
+        self.pdf_list_view.setDefaultDropAction(Qt.MoveAction)
+        self.pdf_list_view.setDragDropOverwriteMode(False)
+        self.pdf_list_view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.pdf_list_view.doubleClicked.connect(self.show_page_preview)
+        layout.addWidget(self.pdf_list_view, 1, 0, 6, 1)  # 1행 0열부터 2행 1열까지(세로로 2칸 차지)
 
         self.merge_button = QPushButton("PDF 합치기")
         self.merge_button.setFixedSize(120, 40)
@@ -136,8 +478,81 @@ class PdfManager(QWidget):
         self.clear_button.clicked.connect(self.clear_pdf_list)
         layout.addWidget(self.clear_button, 6, 1) 
 
+        # 실행 중인 작업 목록 및 취소 버튼
+        self.job_list_widget = QListWidget()
+        self.job_list_widget.setFixedHeight(90)
+        self.job_list_widget.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        layout.addWidget(self.job_list_widget, 7, 0)
+
+        self.cancel_job_button = QPushButton("작업 취소")
+        self.cancel_job_button.setFixedSize(120, 40)
+        self.cancel_job_button.clicked.connect(self.cancel_selected_jobs)
+        layout.addWidget(self.cancel_job_button, 7, 1)
+
         self.setLayout(layout)
 
+    # 작업 스레드 관리
+    def start_job(self, title, func, *args, on_finished=None, **kwargs):
+        job = JobRunnable(title, func, *args, **kwargs)
+        job.setAutoDelete(False)  # 완료 시그널 처리 전까지 파이썬 쪽에서 참조 유지
+        item = QListWidgetItem(f"{title} - 대기 중")
+        self.job_list_widget.addItem(item)
+        self.jobs[job] = item
+
+        job.signals.progress.connect(lambda done, total: self.on_job_progress(job, done, total))
+        job.signals.finished.connect(lambda result: self.on_job_done(job, result, on_finished))
+        job.signals.failed.connect(lambda e: self.on_job_failed(job, e))
+        job.signals.cancelled.connect(lambda: self.on_job_cancelled(job))
+        self.thread_pool.start(job)
+        return job
+
+    def on_job_progress(self, job, done, total):
+        item = self.jobs.get(job)
+        if item is not None and total > 0:
+            item.setText(f"{job.title} - {done}/{total} ({done * 100 // total}%)")
+
+    def remove_job(self, job):
+        item = self.jobs.pop(job, None)
+        if item is not None:
+            self.job_list_widget.takeItem(self.job_list_widget.row(item))
+
+    def on_job_done(self, job, result, on_finished):
+        self.remove_job(job)
+        if on_finished is not None:
+            on_finished(result)
+
+    def on_job_failed(self, job, e):
+        self.remove_job(job)
+        if isinstance(e, PageRangeError):
+            QMessageBox.warning(self, "입력 오류", str(e))
+        else:
+            QMessageBox.critical(self, "오류", f"{job.title} 실패: {e}")
+
+    def on_job_cancelled(self, job):
+        self.remove_job(job)
+
+    def cancel_selected_jobs(self):
+        selected_items = self.job_list_widget.selectedItems()
+        if not selected_items:
+            QMessageBox.warning(self, "경고", "취소할 작업을 선택하세요.")
+            return
+        for job, item in list(self.jobs.items()):
+            if item in selected_items:
+                job.cancel()
+                item.setText(f"{job.title} - 취소 중")
+
+    def closeEvent(self, event):
+        # 종료 시 실행 중인 작업을 모두 취소하고 끝날 때까지 대기
+        for job in list(self.jobs):
+            job.cancel()
+        self.thread_pool.waitForDone()
+        self.thumbnail_pool.clear()
+        self.thumbnail_pool.waitForDone()
+        self.doc_index.close()
+        input_cache.clear()
+        tracer.close()
+        super().closeEvent(event)
+
     def show_about(self):
         QMessageBox.about(self, f"About {APP_NAME}",
             f"{APP_NAME}\nVersion {VERSION}\n\n"
@@ -155,29 +570,62 @@ class PdfManager(QWidget):
         return QUrl("https://github.com/SaeByeolMun/PDFManager/tree/main/licenses")
 
     def handle_pdf_dropped(self, pdf_paths):
-        for path in pdf_paths:
-            if path not in self.pdf_file_paths:  # 중복 방지
-                self.pdf_file_paths.append(path)
-                item = QListWidgetItem(path.split("/")[-1])  # 파일명만 표시
-                item.setToolTip(path)  # 전체 경로는 툴팁으로 제공
-                self.pdf_list_widget.addItem(item)
+        if not any(os.path.isdir(path) for path in pdf_paths):
+            self.index_new_paths(self.pdf_model.add_paths([os.path.normpath(path) for path in pdf_paths]))
+            return
+        # 폴더는 작업 스레드에서 하위 폴더까지 찾고, 찾는 대로 목록에 조금씩 추가
+        signals = PathBatchSignals()
+        found = []
+        signals.batch.connect(lambda paths: found.extend(self.pdf_model.add_paths(paths)))
+
+        def on_scanned(_, signals=signals):
+            self.index_new_paths(found)
+        self.start_job("폴더에서 PDF 찾기", scan_pdf_paths, pdf_paths, signals.batch.emit, on_finished=on_scanned)
+
+    def index_new_paths(self, new_paths):
+        if new_paths:
+            # 페이지 수 등은 작업 스레드에서 미리 읽어 둔다 (이미 색인된 파일은 캐시에서 바로 확인)
+            self.start_job("문서 정보 읽기", self.doc_index.index_paths, new_paths)
+
+    def selected_pdf_paths(self):
+        """ 선택한 파일 경로 (목록 순서) """
+        rows = sorted(index.row() for index in self.pdf_list_view.selectionModel().selectedRows())
+        return [self.pdf_model.path(row) for row in rows]
+
+    def request_thumbnail(self, path, page, size):
+        if self.thumbnail_cache is not None:
+            self.thumbnail_pool.start(ThumbnailTask(self.thumbnail_cache, self.thumbnail_signals, path, page, size))
+
+    def on_thumbnail_ready(self, path, page, size, data):
+        if size == THUMBNAIL_SIZE and page == 1:
+            pixmap = QPixmap()
+            if data is not None and pixmap.loadFromData(data):
+                self.pdf_model.set_icon(path, QIcon(pixmap))
+        if self.preview_dialog is not None and self.preview_dialog.path == path and size == PREVIEW_SIZE:
+            self.preview_dialog.show_page(page, data)
+
+    def show_page_preview(self, index):
+        path = self.pdf_model.path(index.row())
+        info = self.doc_index.lookup(path)
+        page_count = info.page_count if info is not None and info.page_count else 1
+        self.preview_dialog = PagePreviewDialog(self, path, page_count)
+        self.preview_dialog.exec_()
+        self.preview_dialog = None
 
     def clear_pdf_list(self):
-        self.pdf_file_paths.clear()
-        self.pdf_list_widget.clear()
+        self.pdf_model.clear()
 
     def remove_selected_pdf(self):
-        selected_items = self.pdf_list_widget.selectedItems()
-        if not selected_items:
+        selected_rows = self.pdf_list_view.selectionModel().selectedRows()
+        if not selected_rows:
             QMessageBox.warning(self, "경고", "삭제할 PDF 파일을 선택하세요.")
             return
 
-        for item in selected_items:
-            self.pdf_file_paths.remove(item.toolTip())
+        self.pdf_model.remove_rows(index.row() for index in selected_rows)
 
     # PDF 합치기 기능
     def merge_pdfs(self):
-        if self.pdf_list_widget.count() <= 1:
+        if self.pdf_model.rowCount() <= 1:
             QMessageBox.warning(self, "경고", "2개 이상의 pdf 파일이 필요합니다.")
             return
         
@@ -186,24 +634,31 @@ class PdfManager(QWidget):
         if not save_path:
             return
 
-        try:
-            merger = PdfMerger()
-            # QListWidget의 순서대로 파일 경로를 가져옴
-            for i in range(self.pdf_list_widget.count()):
-                item = self.pdf_list_widget.item(i)
-                path = item.toolTip()  # 전체 경로는 toolTip에 저장되어 있음
-                print(path)
-                merger.append(path)
-            merger.write(save_path)
-            merger.close()
-            QMessageBox.information(self, "완료", f"PDF가 성공적으로 저장되었습니다:\n{save_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "오류", f"PDF 합치기 실패: {e}")
+        option_dialog = MergeOptionDialog(self)
+        if option_dialog.exec_() != QDialog.Accepted:
+            return
+        optimize, recompress = option_dialog.get_option()
+
+        # 목록에 보이는 순서대로 파일 경로를 가져옴
+        pdf_paths = self.pdf_model.all_paths()
+        # 같은 파일을 같은 옵션으로 이미 합쳐 두었다면 다시 합치지 않는다
+        journal_spec = ("merge", pdf_paths, save_path, {"optimize": optimize, "recompress": recompress})
+        self.start_job("PDF 합치기", run_with_journal, merge_pdf_files, pdf_paths, save_path,
+                       on_finished=self.on_merged, optimize=optimize, recompress=recompress,
+                       journal_spec=journal_spec)
+
+    def on_merged(self, result):
+        mb = 1024 * 1024
+        QMessageBox.information(self, "완료",
+            f"PDF가 성공적으로 저장되었습니다:\n{result.path}\n"
+            f"파일 크기: {result.size_before / mb:.1f} MB → {result.size_after / mb:.1f} MB\n"
+            f"저장 시간: {result.write_seconds:.1f}초\n"
+            f"최대 메모리 사용량: {result.peak_rss_bytes / mb:.0f} MB")
 
     # pdf 분할 기능 추가   
     def split_selected_pdf(self):
-        selected_items = self.pdf_list_widget.selectedItems()
-        if not selected_items:
+        selected_paths = self.selected_pdf_paths()
+        if not selected_paths:
             QMessageBox.warning(self, "경고", "분할할 PDF 파일을 선택하세요.")
             return
 
@@ -212,108 +667,31 @@ class PdfManager(QWidget):
         if not folder:
             return
 
-        for item in selected_items:
-            pdf_path = item.toolTip()
+        for pdf_path in selected_paths:
             dialog = SplitOptionDialog(self)
             if dialog.exec_() == QDialog.Accepted: 
                 option, page_range = dialog.get_option()
-                if option == "all":
-                    # 범위별로 각각 저장 (기존처럼 각 페이지/범위별로 파일 생성)
-                    try:
-                        reader = PdfReader(pdf_path)
-                        for i, page in enumerate(reader.pages):
-                            writer = PdfWriter()
-                            writer.add_page(page)
-                            out_path = os.path.join(folder, f"{os.path.basename(pdf_path)}_p{i+1}.pdf")
-                            with open(out_path, "wb") as f:
-                                writer.write(f)
-                        QMessageBox.information(self, "완료", f"{pdf_path} 파일이 모든 페이지로 분할 저장되었습니다.")
-                    except Exception as e:
-                        QMessageBox.critical(self, "오류", f"PDF 분할 실패: {e}")
-                
-                elif option == "range_each":
-                    try:
-                        reader = PdfReader(pdf_path)
-                        ranges = page_range.split(",")
-                        for r in ranges:
-                            if "-" in r:
-                                try:
-                                    start, end = map(int, r.split("-"))
-                                except ValueError:
-                                    QMessageBox.warning(self, "입력 오류", "페이지 범위는 정수로 입력하세요.")
-                                    return
-                                if start < 0 or start >= len(reader.pages) \
-                                    or end < 0 or end > len(reader.pages) \
-                                    or start > end: 
-                                    QMessageBox.warning(self, "입력 오류", f"페이지 범위는 1~{len(reader.pages)} 사이의 올바른 값이어야 합니다.")
-                                    return
-                                for i in range(start-1, end):
-                                    writer = PdfWriter()
-                                    writer.add_page(reader.pages[i])
-                                    out_path = os.path.join(folder, f"{APP_NAME}_result_{os.path.basename(pdf_path)}_p{i+1}.pdf")
-                                    with open(out_path, "wb") as f:
-                                        writer.write(f)
-                            else:
-                                try:
-                                    i = int(r) - 1
-                                except ValueError:
-                                    QMessageBox.warning(self, "입력 오류", "페이지 번호는 정수로 입력하세요.")
-                                    return
-                                if i < 0 or i >= len(reader.pages):
-                                    QMessageBox.warning(self, "입력 오류", f"페이지 번호는 1~{len(reader.pages)} 사이여야 합니다.")
-                                    return
-                                writer = PdfWriter()
-                                writer.add_page(reader.pages[i])
-                                out_path = os.path.join(folder, f"{APP_NAME}_result_{os.path.basename(pdf_path)}_p{i+1}.pdf")
-                                with open(out_path, "wb") as f:
-                                    writer.write(f)
-                        QMessageBox.information(self, "완료", f"{pdf_path} 파일이 선택한 페이지 범위로 분할 저장되었습니다.")
-                    except Exception as e:
-                        QMessageBox.critical(self, "오류", f"PDF 분할 실패: {e}")
-
-                elif option == "range_merge":
-                    # 범위 전체를 하나의 PDF로 저장 (PdfWriter에 여러 페이지 추가 후 한 파일로 저장)
+                info = self.doc_index.lookup(pdf_path)
+                if option != "all" and info is not None and info.page_count:
+                    # 색인된 페이지 수로 바로 범위 검사 (색인 전이면 작업 스레드에서 검사)
                     try:
-                        reader = PdfReader(pdf_path)
-                        writer = PdfWriter()
-                        ranges = page_range.split(",")
-
-                        for r in ranges:
-                            if "-" in r:
-                                try:
-                                    start, end = map(int, r.split("-"))
-                                except ValueError:
-                                    QMessageBox.warning(self, "입력 오류", "페이지 범위는 정수로 입력하세요.")
-                                    return
-                                if start < 0 or start >= len(reader.pages) \
-                                    or end < 0 or end > len(reader.pages) \
-                                    or start > end: 
-                                    QMessageBox.warning(self, "입력 오류", f"페이지 범위는 1~{len(reader.pages)} 사이의 올바른 값이어야 합니다.")
-                                    return
-                                for i in range(start-1, end):
-                                    writer.add_page(reader.pages[i])
-                            else:
-                                try:
-                                    i = int(r) - 1
-                                except ValueError:
-                                    QMessageBox.warning(self, "입력 오류", "페이지 번호는 정수로 입력하세요.")
-                                    return
-                                if i < 0 or i >= len(reader.pages):
-                                    QMessageBox.warning(self, "입력 오류", f"페이지 번호는 1~{len(reader.pages)} 사이여야 합니다.")
-                                    return
-                                writer.add_page(reader.pages[i])
-                        base = pdf_path.rsplit('.', 1)[0]
-                        text_range = '_'.join(ranges)
-                        out_path = os.path.join(folder, f"{APP_NAME}_result_{os.path.basename(pdf_path)}_split_{text_range}.pdf")
-                        with open(out_path, "wb") as f:
-                            writer.write(f)
-                        QMessageBox.information(self, "완료", f"{pdf_path} 파일이 선택한 페이지 범위로 분할 저장되었습니다.")
-                    except Exception as e:
-                        QMessageBox.critical(self, "오류", f"PDF 분할 실패: {e}")
+                        parse_page_ranges(page_range or "", info.page_count)
+                    except PageRangeError as e:
+                        QMessageBox.warning(self, "입력 오류", str(e))
+                        return
+                if option == "all":
+                    message = f"{pdf_path} 파일이 모든 페이지로 분할 저장되었습니다."
+                else:
+                    message = f"{pdf_path} 파일이 선택한 페이지 범위로 분할 저장되었습니다."
+                # 중단된 분할을 다시 실행하면 이미 저장된 파일은 건너뛴다
+                journal_spec = ("split", [pdf_path], folder, {"mode": option, "ranges": page_range})
+                self.start_job(f"PDF 분할: {os.path.basename(pdf_path)}", run_with_journal, split_pdf,
+                               pdf_path, folder, option, page_range, journal_spec=journal_spec,
+                               on_finished=lambda _, message=message: QMessageBox.information(self, "완료", message))
 
     def save_pdf_as_images(self):
-        selected_items = self.pdf_list_widget.selectedItems()
-        if not selected_items:
+        pdf_paths = self.selected_pdf_paths()
+        if not pdf_paths:
             QMessageBox.warning(self, "경고", "이미지로 저장할 PDF 파일을 선택하세요.")
             return
 
@@ -321,33 +699,63 @@ class PdfManager(QWidget):
         if format_dialog.exec_() != QDialog.Accepted:
             return
         img_format, ext, dpi = format_dialog.get_format()  # ("PNG", "png", 300)
+        memory_limit_mb = format_dialog.get_memory_limit()
+        workers = format_dialog.get_workers()
+        encode = format_dialog.get_encode_options()
+        extract = format_dialog.get_extract()
+        renderer = format_dialog.get_renderer()
 
         folder = QFileDialog.getExistingDirectory(self, "이미지를 저장할 폴더 선택")
         if not folder:
             return
 
-        for item in selected_items:
-            pdf_path = item.toolTip()
-            try:
-                images = convert_from_path(
-                    pdf_path,
-                    dpi=dpi,
-                    poppler_path=r"C:\poppler-24.08.0\Library\bin"
-                )
-                base = os.path.splitext(os.path.basename(pdf_path))[0]
-                for i, img in enumerate(images):
-                    img_path = os.path.join(folder, f"{base}_page{i+1}.{ext}")
-                    img.save(img_path, img_format)
+        # 중단된 작업을 다시 실행하면 이미 저장된 페이지는 건너뛴다
+        journal_spec = ("render", pdf_paths, folder, {"format": img_format, "dpi": dpi, "encode": encode,
+                                                      "extract": extract, "renderer": renderer})
+        self.start_job("PDF 이미지로 저장", run_with_journal, render_pdfs_to_images,
+                       pdf_paths, folder, img_format, ext, dpi, memory_limit_mb, workers,
+                       on_finished=self.on_images_saved, index=self.doc_index, encode=encode,
+                       extract=extract, renderer=renderer, journal_spec=journal_spec)
+
+    def on_images_saved(self, errors):
+        for pdf_path, e in errors.items():
+            if e is None:
                 QMessageBox.information(self, "완료", f"{pdf_path} 파일이 이미지로 저장되었습니다.")
-            except Exception as e:
+            else:
                 QMessageBox.critical(self, "오류", f"이미지 저장 실패: {e}")
 
 
+class MergeOptionDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("PDF 합치기 옵션")
+        self.resize(300, 120)
+
+        self.optimize_check = QCheckBox("중복 리소스 제거 (같은 폰트/이미지를 한 번만 저장)")
+        self.recompress_check = QCheckBox("압축되지 않은 내용 스트림 압축")
+        self.recompress_check.setEnabled(False)
+        self.optimize_check.toggled.connect(self.recompress_check.setEnabled)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.optimize_check)
+        layout.addWidget(self.recompress_check)
+        layout.addWidget(self.button_box)
+        self.setLayout(layout)
+
+    def get_option(self):
+        optimize = self.optimize_check.isChecked()
+        return optimize, optimize and self.recompress_check.isChecked()
+
+
 class SplitOptionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("PDF 분할 옵션")
-        self.resize(350, 180)
+        self.resize(350, 210)
 
         self.all_radio = QRadioButton("전체 페이지 분할")
         self.range_radio = QRadioButton("페이지 범위 지정 (예: 1-3, 5)")
@@ -356,9 +764,11 @@ class SplitOptionDialog(QDialog):
         self.range_edit.setEnabled(False)
 
         self.range_mode_each = QRadioButton("범위별로 각각 저장")
+        self.range_mode_group = QRadioButton("범위마다 하나의 PDF로 저장")
         self.range_mode_merge = QRadioButton("범위 전체를 하나의 PDF로 저장")
         self.range_mode_each.setChecked(True)
         self.range_mode_each.setEnabled(False)
+        self.range_mode_group.setEnabled(False)
         self.range_mode_merge.setEnabled(False)
 
         # 그룹 설정: all_radio와 range_radio만 같은 그룹으로 묶음
@@ -372,6 +782,7 @@ class SplitOptionDialog(QDialog):
         def on_range_radio_toggled(checked):
             self.range_edit.setEnabled(checked)
             self.range_mode_each.setEnabled(checked)
+            self.range_mode_group.setEnabled(checked)
             self.range_mode_merge.setEnabled(checked)
             if not checked:
                 self.range_mode_each.setChecked(True)
@@ -385,6 +796,7 @@ class SplitOptionDialog(QDialog):
         range_layout.addWidget(self.range_edit)
         radio_layout.addLayout(range_layout)
         radio_layout.addWidget(self.range_mode_each)
+        radio_layout.addWidget(self.range_mode_group)
         radio_layout.addWidget(self.range_mode_merge)
 
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -398,14 +810,13 @@ class SplitOptionDialog(QDialog):
 
     def get_option(self):
         if self.all_radio.isChecked():
-            print("all")
             return "all", None
         else:
             if self.range_mode_each.isChecked():
-                print("range_each")
                 return "range_each", self.range_edit.text()
+            elif self.range_mode_group.isChecked():
+                return "range_group", self.range_edit.text()
             else:
-                print("range_merge")
                 return "range_merge", self.range_edit.text()
                 
 
@@ -414,7 +825,7 @@ class ImageFormatDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("이미지 포맷 및 해상도 선택")
-        self.resize(300, 200)
+        self.resize(300, 520)
 
         self.png_radio = QRadioButton("PNG")
         self.jpg_radio = QRadioButton("JPEG(JPG)")
@@ -439,6 +850,54 @@ class ImageFormatDialog(QDialog):
         layout.addWidget(QLabel("이미지 해상도(DPI)"))
         layout.addWidget(self.dpi_edit)
 
+        # 렌더링 메모리 한도 (MB) - 이 크기만큼씩 페이지를 나눠 렌더링 후 저장
+        self.memory_edit = QLineEdit()
+        self.memory_edit.setPlaceholderText(f"MB (기본: {RENDER_MEMORY_LIMIT_MB})")
+        self.memory_edit.setText(str(RENDER_MEMORY_LIMIT_MB))
+        layout.addWidget(QLabel("렌더링 메모리 한도(MB)"))
+        layout.addWidget(self.memory_edit)
+
+        # 동시에 실행할 렌더링 작업 수
+        self.workers_edit = QLineEdit()
+        self.workers_edit.setPlaceholderText(f"작업 수 (기본: {RENDER_WORKERS})")
+        self.workers_edit.setText(str(RENDER_WORKERS))
+        layout.addWidget(QLabel("동시 렌더링 작업 수"))
+        layout.addWidget(self.workers_edit)
+
+        # 렌더링 방식 (PDFium은 pypdfium2가 설치된 경우에만 선택 가능)
+        self.renderer_combo = QComboBox()
+        self.renderer_combo.addItem("자동", "auto")
+        self.renderer_combo.addItem("Poppler (pdftoppm 프로세스)", "poppler")
+        self.renderer_combo.addItem("PDFium (프로그램 안에서 렌더링)", "pdfium")
+        available = available_renderers()
+        for i in range(1, self.renderer_combo.count()):
+            if self.renderer_combo.itemData(i) not in available:
+                self.renderer_combo.model().item(i).setEnabled(False)
+        self.renderer_combo.setCurrentIndex(self.renderer_combo.findData(DEFAULT_RENDERER))
+        layout.addWidget(QLabel("렌더링 방식"))
+        layout.addWidget(self.renderer_combo)
+
+        # 인코더 옵션 (PNG 압축 수준을 바꾸면 pdftoppm 대신 PIL로 저장)
+        self.jpeg_quality_spin = QSpinBox()
+        self.jpeg_quality_spin.setRange(1, 95)
+        self.jpeg_quality_spin.setValue(JPEG_QUALITY)
+        layout.addWidget(QLabel("JPEG 품질(1~95)"))
+        layout.addWidget(self.jpeg_quality_spin)
+
+        self.png_level_spin = QSpinBox()
+        self.png_level_spin.setRange(0, 9)
+        self.png_level_spin.setValue(PNG_COMPRESS_LEVEL)
+        layout.addWidget(QLabel("PNG 압축 수준(0~9)"))
+        layout.addWidget(self.png_level_spin)
+
+        self.multipage_tiff_check = QCheckBox("TIFF를 하나의 파일(여러 페이지)로 저장")
+        layout.addWidget(self.multipage_tiff_check)
+
+        # 스캔 문서처럼 페이지가 이미지 하나로 된 경우 렌더링 없이 원본 이미지를 그대로 저장
+        self.extract_check = QCheckBox("원본 이미지 추출 (가능한 페이지는 원본 형식 그대로 저장)")
+        self.extract_check.toggled.connect(lambda checked: self.multipage_tiff_check.setEnabled(not checked))
+        layout.addWidget(self.extract_check)
+
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.button_box.accepted.connect(self.accept)
         self.button_box.rejected.connect(self.reject)
@@ -464,12 +923,47 @@ class ImageFormatDialog(QDialog):
             dpi = 200
         return fmt, ext, dpi
 
-def resource_path(rel_path):
-    base = getattr(sys, '_MEIPASS', os.path.abspath("."))
-    return os.path.join(base, rel_path)
+    def get_memory_limit(self):
+        # 메모리 한도 반환 (정수 변환 실패 또는 0 이하이면 기본값)
+        try:
+            limit = int(self.memory_edit.text())
+        except ValueError:
+            return RENDER_MEMORY_LIMIT_MB
+        return limit if limit > 0 else RENDER_MEMORY_LIMIT_MB
+
+    def get_workers(self):
+        # 렌더링 작업 수 반환 (정수 변환 실패 또는 0 이하이면 기본값)
+        try:
+            workers = int(self.workers_edit.text())
+        except ValueError:
+            return RENDER_WORKERS
+        return workers if workers > 0 else RENDER_WORKERS
+
+    def get_encode_options(self):
+        return EncodeOptions(self.jpeg_quality_spin.value(), self.png_level_spin.value(),
+                             self.multipage_tiff_check.isChecked())
+
+    def get_extract(self):
+        return self.extract_check.isChecked()
+
+    def get_renderer(self):
+        return self.renderer_combo.currentData()
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # PyInstaller 실행 파일에서 분할 작업자 프로세스 지원
     app = QApplication(sys.argv)
     manager = PdfManager()
     manager.show()
+    if os.environ.get("PDFMANAGER_STARTUP_PROBE"):
+        # startup_time.py 측정용: 첫 이벤트 루프에서 시각과 로드된 모듈 정보를 출력하고 종료
+        def probe():
+            print(json.dumps({
+                "shown_at": time.time(),
+                "pdf_libs_loaded": sorted(m for m in ("PyPDF2", "pdf2image", "pypdfium2") if m in sys.modules),
+            }), flush=True)
+            app.quit()
+        QTimer.singleShot(0, probe)
+    else:
+        # 창을 먼저 띄운 뒤 PDF/렌더링 라이브러리를 백그라운드에서 불러옴
+        QTimer.singleShot(WARM_UP_DELAY_MS, lambda: threading.Thread(target=warm_up, daemon=True).start())
     sys.exit(app.exec_())
@@ -0,0 +1,198 @@
+import os
+import time
+import zlib
+import hashlib
+from collections import namedtuple
+from pdfcore import atomic_path
+
+# 합친 PDF에서 같은 내용의 객체(폰트, 로고 이미지, ICC 프로필 등)를 하나만 남기고 다시 기록한다.
+# PyPDF2의 PdfWriter는 기록할 객체를 지울 수 없어서, 참조 가능한 객체만 골라 새 번호를 붙여 직접 기록한다.
+
+OptimizeResult = namedtuple("OptimizeResult", "size_before size_after objects_before objects_after write_seconds")
+
+# 내용이 같아도 합치면 안 되는 객체 (페이지 트리, 목차, 주석은 각자 위치 정보를 가짐)
+# 주석과 목차 항목은 /Type을 생략할 수 있으므로 unique_object_ids()로 참조 위치에서도 찾는다.
+UNIQUE_TYPES = ("/Page", "/Pages", "/Annot", "/Outlines")
+DEDUP_MAX_PASSES = 8    # 참조 관계를 따라 중복을 합치는 최대 반복 횟수
+
+
+def child_refs(obj):
+    """ obj 안에 들어 있는 간접 참조(IndirectObject) 목록 """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+    refs = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, IndirectObject):
+            refs.append(item)
+        elif isinstance(item, DictionaryObject):
+            stack.extend(v for k, v in item.items() if not (k == "/Length" and isinstance(item, StreamObject)))
+        elif isinstance(item, ArrayObject):
+            stack.extend(item)
+    return refs
+
+def remap(obj, mapping):
+    """ 간접 참조 번호를 mapping(이전 번호 -> 새 번호)에 따라 바꾼 복사본 """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject, NullObject
+    if isinstance(obj, IndirectObject):
+        new_id = mapping.get(obj.idnum)
+        return NullObject() if new_id is None else IndirectObject(new_id, 0, None)
+    if isinstance(obj, StreamObject):
+        new = type(obj)()
+        new._data = obj._data
+        for k, v in obj.items():
+            if k != "/Length":  # 기록할 때 실제 길이로 다시 넣음
+                new[k] = remap(v, mapping)
+        return new
+    if isinstance(obj, DictionaryObject):
+        return DictionaryObject({k: remap(v, mapping) for k, v in obj.items()})
+    if isinstance(obj, ArrayObject):
+        return ArrayObject(remap(v, mapping) for v in obj)
+    return obj
+
+def unique_object_ids(objects, root_ref):
+    """ 참조 위치로 찾은, 합치면 안 되는 객체 번호: 페이지 트리 노드, 페이지 /Annots의 주석(한 페이지에서만
+        참조할 수 있음), 목차 트리 항목. objects: {번호: 객체} """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    def resolve(value):
+        return objects.get(value.idnum) if isinstance(value, IndirectObject) else value
+
+    def entry(node, key):
+        return node.raw_get(key) if key in node else None
+
+    unique = set()
+    root = resolve(root_ref)
+    if not isinstance(root, DictionaryObject):
+        return unique
+    stack = [entry(root, "/Pages")]
+    while stack:
+        ref = stack.pop()
+        node = resolve(ref)
+        if not isinstance(node, DictionaryObject):
+            continue
+        if isinstance(ref, IndirectObject):
+            if ref.idnum in unique:
+                continue
+            unique.add(ref.idnum)
+        kids = resolve(entry(node, "/Kids"))
+        if isinstance(kids, ArrayObject):
+            stack.extend(kids)
+        annots = resolve(entry(node, "/Annots"))
+        if isinstance(annots, ArrayObject):
+            unique.update(annot.idnum for annot in annots if isinstance(annot, IndirectObject))
+    stack = [entry(root, "/Outlines")]
+    while stack:
+        ref = stack.pop()
+        if not isinstance(ref, IndirectObject) or ref.idnum in unique:
+            continue
+        node = objects.get(ref.idnum)
+        if isinstance(node, DictionaryObject):
+            unique.add(ref.idnum)
+            stack.extend(entry(node, key) for key in ("/First", "/Next"))
+    return unique
+
+def serialize(obj):
+    from io import BytesIO
+    buf = BytesIO()
+    obj.write_to_stream(buf, None)
+    return buf.getvalue()
+
+def compress_stream(obj):
+    """ 필터가 없는 스트림을 FlateDecode로 압축 (작아지는 경우에만) """
+    from PyPDF2.generic import EncodedStreamObject, NameObject
+    if "/Filter" in obj or obj.get("/Type") == "/Metadata":
+        return obj
+    data = zlib.compress(obj._data, 9)
+    if len(data) >= len(obj._data):
+        return obj
+    new = EncodedStreamObject()
+    new.update(obj)
+    new[NameObject("/Filter")] = NameObject("/FlateDecode")
+    new._data = data
+    return new
+
+def optimize_pdf(src_path, dst_path, recompress=False):
+    """ src_path를 읽어 중복 객체를 제거(필요하면 압축)한 결과를 dst_path에 기록 """
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import DictionaryObject, StreamObject, NullObject, NameObject, NumberObject
+
+    start = time.perf_counter()
+    size_before = os.path.getsize(src_path)
+    reader = PdfReader(src_path)
+    if reader.is_encrypted:
+        raise ValueError("암호화된 PDF는 최적화할 수 없습니다.")
+
+    # 1) 문서 루트와 정보 사전에서 참조 가능한 객체만 찾는다 (발견 순서 = 새 번호 순서)
+    trailer_refs = [reader.trailer.raw_get(k) for k in ("/Root", "/Info") if k in reader.trailer]
+    objects = {}
+    order = []
+    stack = list(reversed(trailer_refs))
+    while stack:
+        ref = stack.pop()
+        if ref.idnum in objects:
+            continue
+        obj = ref.get_object()
+        objects[ref.idnum] = NullObject() if obj is None else obj
+        order.append(ref.idnum)
+        stack.extend(reversed(child_refs(obj)))
+
+    # 2) 내용이 같은 객체를 대표 번호 하나로 모은다. 참조하는 객체가 합쳐지면 참조하는 쪽도
+    #    같아질 수 있으므로(같은 폰트 파일을 가리키는 폰트 사전 등) 더 이상 바뀌지 않을 때까지 반복한다.
+    data_hash = {idnum: hashlib.sha256(obj._data).digest()
+                 for idnum, obj in objects.items() if isinstance(obj, StreamObject)}
+    canonical = {idnum: idnum for idnum in order}
+    unique = unique_object_ids(objects, reader.trailer.raw_get("/Root"))
+    for _ in range(DEDUP_MAX_PASSES):
+        seen = {}
+        changed = False
+        for idnum in order:
+            obj = objects[idnum]
+            if not isinstance(obj, DictionaryObject) or idnum in unique or obj.get("/Type") in UNIQUE_TYPES:
+                continue
+            # 스트림은 사전 부분만 직렬화하고 데이터는 해시로 비교
+            key = (serialize(DictionaryObject(remap(obj, canonical))), data_hash.get(idnum))
+            target = seen.setdefault(key, idnum)
+            if canonical[idnum] != target:
+                canonical[idnum] = target
+                changed = True
+        if not changed:
+            break
+
+    # 3) 대표 객체에만 새 번호를 붙이고 기록
+    new_ids = {}
+    for idnum in order:
+        if canonical[idnum] == idnum:
+            new_ids[idnum] = len(new_ids) + 1
+    mapping = {idnum: new_ids[canonical[idnum]] for idnum in order}
+
+    with atomic_path(dst_path) as tmp_path, open(tmp_path, "wb") as f:
+        header = reader.pdf_header if isinstance(reader.pdf_header, str) else reader.pdf_header.decode()
+        f.write(header.encode() + b"\n%\xE2\xE3\xCF\xD3\n")
+        offsets = []
+        for idnum in order:
+            if canonical[idnum] != idnum:
+                continue
+            obj = remap(objects[idnum], mapping)
+            if recompress and isinstance(obj, StreamObject):
+                obj = compress_stream(obj)
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % len(offsets))
+            obj.write_to_stream(f, None)
+            f.write(b"\nendobj\n")
+
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        trailer = DictionaryObject()
+        for key in ("/Root", "/Info", "/ID"):
+            if key in reader.trailer:
+                trailer[NameObject(key)] = remap(reader.trailer.raw_get(key), mapping)
+        trailer[NameObject("/Size")] = NumberObject(len(offsets) + 1)
+        f.write(b"trailer\n")
+        trailer.write_to_stream(f, None)
+        f.write(b"\nstartxref\n%d\n%%%%EOF\n" % xref)
+
+    return OptimizeResult(size_before, os.path.getsize(dst_path), len(order), len(offsets),
+                          time.perf_counter() - start)
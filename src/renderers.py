@@ -0,0 +1,198 @@
+import sys
+import os
+import re
+import time
+import shutil
+import threading
+from importlib.util import find_spec
+
+# 페이지 렌더링 방식
+#   poppler: pdf2image로 pdftoppm/pdfinfo 프로세스를 실행한다. 호출마다 프로세스를 띄우지만 여러 구간을 동시에
+#            렌더링할 수 있고, PNG/JPEG/TIFF는 pdftoppm이 파일을 바로 쓴다.
+#   pdfium:  pypdfium2(선택 설치)로 현재 프로세스 안에서 렌더링한다. 프로세스 실행과 PPM 전달 비용이 없지만
+#            pdfium 라이브러리는 스레드에 안전하지 않아 한 번에 한 구간씩만 렌더링한다.
+#   auto:    Poppler를 찾으면 poppler, 없으면 pdfium
+# 어느 쪽이 빠른지는 문서에 따라 다르므로 benchmark_renderers()로 비교할 수 있다.
+
+RENDERERS = ("auto", "poppler", "pdfium")
+DEFAULT_RENDERER = "auto"
+POPPLER_ENV = "PDFMANAGER_POPPLER_PATH"     # Poppler bin 폴더를 직접 지정하는 환경 변수
+LEGACY_POPPLER_PATH = r"C:\poppler-24.08.0\Library\bin"    # 이전 버전에서 사용하던 설치 위치
+RENDERER_BENCH_PAGES = 5    # 렌더러 비교 시 렌더링할 페이지 수
+PDFINFO_LAST_PAGE = 2 ** 31 - 1    # pdfinfo -l 값 (문서의 마지막 페이지로 줄어듦 = 모든 페이지)
+PAGE_SIZE_RE = re.compile(r"^Page\s+\d+ size$")   # pdfinfo -f/-l 출력의 페이지별 크기 항목
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller
+        개발 환경에서는 src 폴더에 없으면 저장소 최상위(data/, poppler_bin/)에서 찾는다. """
+    here = os.path.dirname(os.path.abspath(__file__))
+    base_path = getattr(sys, '_MEIPASS', here)
+    path = os.path.join(base_path, relative_path)
+    if not hasattr(sys, '_MEIPASS') and not os.path.exists(path):
+        root_path = os.path.join(os.path.dirname(here), relative_path)
+        if os.path.exists(root_path):
+            return root_path
+    return path
+
+def parse_page_size(info, key="Page size"):
+    """ pdfinfo의 "Page size" 값("612 x 792 pts (letter)")을 (가로, 세로) pt로 변환 """
+    try:
+        w, _, h = info[key].split()[:3]
+        return float(w), float(h)
+    except (KeyError, ValueError):
+        return 595.0, 842.0  # 알 수 없으면 A4 기준
+
+def largest_page_size(sizes):
+    """ 면적이 가장 큰 페이지 크기 (렌더링 메모리 계산 기준) """
+    return max(sizes, key=lambda s: s[0] * s[1]) if sizes else (595.0, 842.0)
+
+def is_poppler_dir(path):
+    # 현재 운영체제에서 실행할 수 있는 pdftoppm이 있는 폴더인지 (리눅스에서 동봉된 Windows용 .exe는 제외)
+    exe = "pdftoppm.exe" if sys.platform == "win32" else "pdftoppm"
+    return bool(path) and os.path.isfile(os.path.join(path, exe))
+
+_poppler_lock = threading.Lock()
+_poppler_path = []      # 찾은 결과 캐시 ([] = 아직 찾지 않음, [None] = PATH 사용)
+
+def set_poppler_path(path):
+    """ Poppler bin 폴더를 직접 지정 (None이면 다시 자동으로 찾음) """
+    with _poppler_lock:
+        _poppler_path[:] = [path] if path else []
+
+def find_poppler_path():
+    """ Poppler bin 폴더. 환경 변수 -> 실행 파일에 동봉된 poppler_bin -> 이전 설치 위치 순으로 찾고,
+        모두 없으면 None을 반환해 pdf2image가 PATH에서 찾게 한다. """
+    with _poppler_lock:
+        if _poppler_path:
+            return _poppler_path[0]
+        candidates = [
+            os.environ.get(POPPLER_ENV),
+            resource_path("poppler_bin"),
+            resource_path("poppler"),       # pyinstaller --add-data "...;poppler"
+            LEGACY_POPPLER_PATH,
+        ]
+        found = next((os.path.abspath(path) for path in candidates if is_poppler_dir(path)), None)
+        _poppler_path[:] = [found]
+        return found
+
+def poppler_available():
+    return find_poppler_path() is not None or shutil.which("pdftoppm") is not None
+
+
+class PopplerRenderer:
+    """ pdftoppm 프로세스로 렌더링 (pdf2image) """
+    name = "poppler"
+    direct = True   # pdftoppm이 PNG/JPEG/TIFF 파일을 바로 쓸 수 있음
+
+    def available(self):
+        return poppler_available()
+
+    def warm_up(self):
+        import pdf2image  # noqa: F401
+
+    def info(self, pdf_path):
+        """ (페이지 수, 가장 큰 페이지 크기 pt) """
+        from pdf2image import pdfinfo_from_path
+        info = pdfinfo_from_path(pdf_path, poppler_path=find_poppler_path(), first_page=1,
+                                 last_page=PDFINFO_LAST_PAGE)
+        sizes = [parse_page_size(info, key) for key in info if PAGE_SIZE_RE.match(key)]
+        return int(info["Pages"]), largest_page_size(sizes) if sizes else parse_page_size(info)
+
+    def render(self, pdf_path, first, last, dpi=200, size=None):
+        """ first~last 페이지를 PIL 이미지 목록으로 렌더링 (size가 있으면 긴 변을 size px로 맞춤) """
+        from pdf2image import convert_from_path
+        kwargs = {"size": size} if size else {"dpi": dpi}
+        return convert_from_path(pdf_path, first_page=first, last_page=last,
+                                 poppler_path=find_poppler_path(), **kwargs)
+
+    def render_to_files(self, pdf_path, folder, first, last, dpi, fmt, prefix, jpegopt=None):
+        """ pdftoppm이 folder에 prefix로 시작하는 이미지 파일을 바로 쓰고 경로 목록을 반환 """
+        from pdf2image import convert_from_path
+        kwargs = {"jpegopt": jpegopt} if jpegopt else {}
+        return convert_from_path(pdf_path, dpi=dpi, first_page=first, last_page=last, output_folder=folder,
+                                 output_file=prefix, fmt=fmt, paths_only=True,
+                                 poppler_path=find_poppler_path(), **kwargs)
+
+
+class PdfiumRenderer:
+    """ pypdfium2로 현재 프로세스 안에서 렌더링 """
+    name = "pdfium"
+    direct = False
+    lock = threading.Lock()     # pdfium은 스레드에 안전하지 않으므로 한 번에 한 스레드만 사용
+
+    def available(self):
+        return find_spec("pypdfium2") is not None
+
+    def warm_up(self):
+        import pypdfium2  # noqa: F401
+
+    def info(self, pdf_path):
+        import pypdfium2 as pdfium
+        with self.lock:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                return len(pdf), largest_page_size([tuple(pdf.get_page_size(i)) for i in range(len(pdf))])
+            finally:
+                pdf.close()
+
+    def render(self, pdf_path, first, last, dpi=200, size=None):
+        import pypdfium2 as pdfium
+        images = []
+        with self.lock:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                for i in range(first - 1, min(last, len(pdf))):
+                    page = pdf[i]
+                    try:
+                        scale = size / max(page.get_size()) if size else dpi / 72
+                        images.append(page.render(scale=scale).to_pil())
+                    finally:
+                        page.close()
+            finally:
+                pdf.close()
+        return images
+
+
+_RENDERERS = {"poppler": PopplerRenderer(), "pdfium": PdfiumRenderer()}
+
+def available_renderers():
+    return [name for name, renderer in _RENDERERS.items() if renderer.available()]
+
+def get_renderer(name=DEFAULT_RENDERER):
+    """ 이름으로 렌더러를 찾는다. auto는 Poppler -> PDFium 순으로 사용할 수 있는 것을 고른다. """
+    if name == "auto":
+        for renderer in _RENDERERS.values():
+            if renderer.available():
+                return renderer
+        raise RuntimeError("Poppler(pdftoppm)를 찾을 수 없고 pypdfium2도 설치되어 있지 않습니다.")
+    renderer = _RENDERERS.get(name)
+    if renderer is None:
+        raise ValueError(f"알 수 없는 렌더러: {name}")
+    if not renderer.available():
+        raise RuntimeError(f"{name} 렌더러를 사용할 수 없습니다.")
+    return renderer
+
+def benchmark_renderers(pdf_path, dpi=150, pages=RENDERER_BENCH_PAGES):
+    """ 사용할 수 있는 렌더러마다 앞쪽 pages 페이지를 한 번에(구간 렌더링) / 한 페이지씩(미리보기) 렌더링한 시간을 잰다.
+        반환값: [{"renderer", "pages", "batch_seconds", "single_seconds", "error"}, ...] (구간 렌더링이 빠른 순) """
+    results = []
+    for name in available_renderers():
+        renderer = _RENDERERS[name]
+        result = {"renderer": name, "pages": 0, "batch_seconds": None, "single_seconds": None, "error": None}
+        try:
+            count = min(pages, renderer.info(pdf_path)[0])
+            result["pages"] = count
+            start = time.perf_counter()
+            for img in renderer.render(pdf_path, 1, count, dpi):
+                img.close()
+            result["batch_seconds"] = time.perf_counter() - start
+            start = time.perf_counter()
+            for page in range(1, count + 1):
+                for img in renderer.render(pdf_path, page, page, dpi):
+                    img.close()
+            result["single_seconds"] = time.perf_counter() - start
+        except Exception as e:
+            result["error"] = str(e)
+        results.append(result)
+    return sorted(results, key=lambda r: float("inf") if r["batch_seconds"] is None else r["batch_seconds"])
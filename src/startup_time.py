@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# 실행 시작 시간 측정 도구
+#   python startup_time.py                       # import 시간 상위 항목 + 첫 화면까지의 시간
+#   python startup_time.py --runs 5 --json startup.json --max-ms 1500
+#   python startup_time.py --exe dist\pdfmanager.exe   # PyInstaller 빌드 결과 측정
+# --max-ms를 넘으면 종료 코드 1을 반환하므로 빌드 스크립트에서 회귀 검사로 사용할 수 있다.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def probe_env():
+    env = dict(os.environ, PDFMANAGER_STARTUP_PROBE="1")
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")  # 화면이 없는 서버에서도 측정
+    return env
+
+def import_breakdown(module="pdfmanager", top=15):
+    """ python -X importtime 결과에서 module 전체 시간과, module이 직접 불러온 모듈들을 누적 시간 순으로 반환 """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=HERE, capture_output=True, text=True, env=probe_env())
+    rows = []
+    total_ms = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() == module:
+            total_ms = int(cumulative_us) / 1000
+        elif depth == 1:
+            rows.append({"module": name.strip(),
+                         "self_ms": int(self_us) / 1000,
+                         "cumulative_ms": int(cumulative_us) / 1000})
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return total_ms, rows[:top]
+
+def time_to_first_window(runs=3, exe=None):
+    """ 프로세스 시작부터 첫 창이 이벤트 루프에 들어갈 때까지의 시간(ms) 목록 """
+    cmd = [exe] if exe else [sys.executable, os.path.join(HERE, "pdfmanager.py")]
+    samples = []
+    loaded = []
+    for _ in range(runs):
+        start = time.time()
+        proc = subprocess.run(cmd, cwd=HERE, capture_output=True, text=True, env=probe_env(), timeout=120)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            raise RuntimeError(f"측정 실패 (종료 코드 {proc.returncode}): {proc.stderr.strip()[-500:]}")
+        result = json.loads(lines[-1])
+        samples.append((result["shown_at"] - start) * 1000)
+        loaded = result["pdf_libs_loaded"]
+    return samples, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDFManager 시작 시간 측정")
+    parser.add_argument("--runs", type=int, default=3, help="첫 화면 측정 반복 횟수")
+    parser.add_argument("--top", type=int, default=15, help="표시할 import 항목 수")
+    parser.add_argument("--exe", help="측정할 실행 파일 (기본: 현재 파이썬으로 pdfmanager.py 실행)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--max-ms", type=float, help="첫 화면까지의 중앙값이 이 값을 넘으면 실패")
+    args = parser.parse_args(argv)
+
+    total_ms, rows = import_breakdown(top=args.top)
+    print(f"import pdfmanager: {total_ms:.1f} ms")
+    for r in rows:
+        print(f"  {r['cumulative_ms']:9.1f} ms  (self {r['self_ms']:7.1f} ms)  {r['module']}")
+
+    samples, loaded = time_to_first_window(args.runs, args.exe)
+    median_ms = statistics.median(samples)
+    print(f"첫 화면까지: 중앙값 {median_ms:.1f} ms, 최소 {min(samples):.1f} ms ({args.runs}회)")
+    print(f"첫 화면 시점에 로드된 PDF 라이브러리: {', '.join(loaded) or '없음'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"import_total_ms": total_ms, "imports": rows,
+                       "first_window_ms": samples, "first_window_median_ms": median_ms,
+                       "pdf_libs_loaded": loaded}, f, ensure_ascii=False, indent=2)
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"기준 초과: {median_ms:.1f} ms > {args.max_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
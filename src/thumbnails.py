@@ -0,0 +1,135 @@
+import os
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+from renderers import DEFAULT_RENDERER, get_renderer
+from docindex import default_cache_dir, file_key
+from tracing import span
+
+# PDF 페이지 미리보기 이미지 캐시.
+# 메모리(LRU) -> 디스크(용량 제한) -> 렌더링 순서로 찾고, 키는 (파일 내용 해시, 페이지, 크기)이다.
+
+THUMBNAIL_SIZE = 64     # 파일 목록 아이콘 크기(px, 긴 변 기준)
+PREVIEW_SIZE = 480      # 페이지 미리보기 창 크기(px, 긴 변 기준)
+THUMBNAIL_MEMORY_ITEMS = 512    # 메모리에 보관할 최대 미리보기 수
+THUMBNAIL_DISK_LIMIT_MB = 128   # 디스크 캐시 최대 크기
+HASH_SAMPLE_BYTES = 64 * 1024   # 파일 해시에 사용하는 앞/뒤 구간 크기
+
+
+def file_hash(path):
+    """ 파일 크기와 앞/뒤 64KB로 만든 해시 (큰 파일도 전체를 읽지 않음) """
+    size, _ = file_key(path)
+    h = hashlib.sha1(str(size).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(HASH_SAMPLE_BYTES))
+        if size > HASH_SAMPLE_BYTES:
+            f.seek(max(HASH_SAMPLE_BYTES, size - HASH_SAMPLE_BYTES))
+            h.update(f.read(HASH_SAMPLE_BYTES))
+    return h.hexdigest()
+
+def render_thumbnail(path, page, size, renderer=DEFAULT_RENDERER):
+    """ 한 페이지를 낮은 해상도로 렌더링해 PNG 바이트로 반환 (page는 1부터) """
+    images = get_renderer(renderer).render(path, page, page, size=size)
+    if not images:
+        raise ValueError(f"{page} 페이지가 없습니다.")
+    img = images[0]
+    try:
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        return buf.getvalue()
+    finally:
+        img.close()
+
+
+class ThumbnailCache:
+    """ 여러 작업 스레드에서 함께 사용하는 2단계(메모리 LRU + 디스크) 미리보기 캐시 """
+    def __init__(self, cache_dir=None, memory_items=THUMBNAIL_MEMORY_ITEMS,
+                 disk_limit_mb=THUMBNAIL_DISK_LIMIT_MB, renderer=DEFAULT_RENDERER):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "thumbnails")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.memory_items = memory_items
+        self.renderer = renderer
+        self.disk_limit = disk_limit_mb * 1024 * 1024
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()     # (해시, 페이지, 크기) -> PNG 바이트
+        self.hashes = {}                # (경로, 크기, 수정 시각) -> 파일 해시
+        self.disk = OrderedDict()       # 디스크 캐시 파일명 -> 크기 (오래된 순)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".png"):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, size in sorted(entries):
+            self.disk[name] = size
+        self.disk_bytes = sum(self.disk.values())
+
+    def key(self, path, page, size):
+        stamp = (path,) + file_key(path)
+        with self.lock:
+            digest = self.hashes.get(stamp)
+        if digest is None:
+            digest = file_hash(path)
+            with self.lock:
+                self.hashes[stamp] = digest
+        return digest, page, size
+
+    def lookup_memory(self, key):
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+            return data
+
+    def remember(self, key, data):
+        with self.lock:
+            self.memory[key] = data
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+    def lookup_disk(self, key):
+        name = "%s_%d_%d.png" % key
+        try:
+            with open(os.path.join(self.cache_dir, name), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        with self.lock:
+            if name in self.disk:
+                self.disk.move_to_end(name)
+        return data
+
+    def store_disk(self, key, data):
+        name = "%s_%d_%d.png" % key
+        tmp_path = os.path.join(self.cache_dir, f"{name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.cache_dir, name))
+        with self.lock:
+            self.disk_bytes += len(data) - self.disk.pop(name, 0)
+            self.disk[name] = len(data)
+            evicted = []
+            while self.disk_bytes > self.disk_limit and len(self.disk) > 1:
+                old, old_size = self.disk.popitem(last=False)
+                self.disk_bytes -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, old))
+            except OSError:
+                pass
+
+    def get(self, path, page=1, size=THUMBNAIL_SIZE):
+        """ PNG 바이트를 반환. 캐시에 없으면 렌더링 후 두 캐시에 저장한다. """
+        key = self.key(path, page, size)
+        data = self.lookup_memory(key)
+        if data is None:
+            data = self.lookup_disk(key)
+            if data is None:
+                with span("thumbnail", path=path, page=page, size=size) as s:
+                    data = render_thumbnail(path, page, size, self.renderer)
+                    s["bytes"] = len(data)
+                self.store_disk(key, data)
+            self.remember(key, data)
+        return data
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import threading
+import itertools
+import contextvars
+from contextlib import contextmanager
+
+# 작업/페이지 단위 구간(span) 기록.
+# 구간이 끝날 때마다 JSON 한 줄을 순환 로그 파일(trace.jsonl, trace.jsonl.1, ...)에 쓰고,
+# 단계별 합계(횟수, 시간, 바이트)는 메모리에 모아 통계 창에서 보여 준다.
+# configure()로 로그 파일을 지정하기 전에는 파일에 쓰지 않고 합계만 모은다.
+#
+#   with span("render", path=pdf_path, pages=3) as s:
+#       ...
+#       s["bytes"] = written
+#
+# 구간 이름: job(작업 전체), merge/split/optimize(작업 단계), open(파일 열기/파싱),
+#            render(렌더링), encode(이미지 인코딩 및 저장), write(PDF 기록), extract(원본 이미지 추출), thumbnail
+
+TRACE_FILE = "trace.jsonl"
+TRACE_MAX_BYTES = 5 * 1024 * 1024   # 로그 파일 하나의 최대 크기
+TRACE_BACKUPS = 3                   # 보관할 이전 로그 파일 수
+
+_current = contextvars.ContextVar("trace_span", default=None)   # 현재 구간 (작업 번호, 구간 번호)
+_ids = itertools.count(1)
+
+
+class Tracer:
+    """ 여러 스레드에서 함께 사용하는 구간 기록기 """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.handler = None
+        self.stats = {}     # 구간 이름 -> [횟수, 합계 초, 최대 초, 바이트, 오류 수]
+
+    def configure(self, path, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS):
+        """ 로그 파일 지정. 파일은 첫 기록 때 만들어지고 max_bytes를 넘으면 순환된다. """
+        from logging.handlers import RotatingFileHandler
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        with self.lock:
+            old, self.handler = self.handler, handler
+        if old is not None:
+            old.close()
+
+    @property
+    def path(self):
+        return self.handler.baseFilename if self.handler is not None else None
+
+    def close(self):
+        with self.lock:
+            handler, self.handler = self.handler, None
+        if handler is not None:
+            handler.close()
+
+    def emit(self, event):
+        with self.lock:
+            stat = self.stats.setdefault(event["name"], [0, 0.0, 0.0, 0, 0])
+            stat[0] += 1
+            stat[1] += event["seconds"]
+            stat[2] = max(stat[2], event["seconds"])
+            stat[3] += event.get("bytes") or 0
+            stat[4] += "error" in event
+            handler = self.handler
+        if handler is not None:
+            import logging
+            handler.handle(logging.makeLogRecord({"msg": json.dumps(event, ensure_ascii=False, default=str)}))
+
+    @contextmanager
+    def span(self, name, **fields):
+        """ with 블록의 소요 시간을 기록. 블록 안에서 반환된 dict에 bytes 등 값을 추가할 수 있다. """
+        parent = _current.get()
+        span_id = next(_ids)
+        job = parent[0] if parent is not None else span_id
+        token = _current.set((job, span_id))
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as e:
+            fields["error"] = type(e).__name__
+            raise
+        finally:
+            _current.reset(token)
+            self.emit({"ts": round(time.time(), 3), "name": name, "job": job, "span": span_id,
+                       "parent": parent[1] if parent is not None else None,
+                       "seconds": round(time.perf_counter() - start, 6),
+                       "pid": os.getpid(), "thread": threading.current_thread().name, **fields})
+
+    def record(self, name, seconds, **fields):
+        """ 다른 프로세스 등에서 이미 잰 구간을 현재 구간의 하위 구간으로 기록 """
+        parent = _current.get()
+        span_id = next(_ids)
+        self.emit({"ts": round(time.time(), 3), "name": name,
+                   "job": parent[0] if parent is not None else span_id, "span": span_id,
+                   "parent": parent[1] if parent is not None else None,
+                   "seconds": round(seconds, 6),
+                   "pid": os.getpid(), "thread": threading.current_thread().name, **fields})
+
+    def summary(self):
+        """ 단계별 합계 [{"name", "count", "seconds", "max_seconds", "bytes", "errors"}, ...] (시간 합계 순) """
+        with self.lock:
+            rows = [{"name": name, "count": count, "seconds": seconds, "max_seconds": max_seconds,
+                     "bytes": nbytes, "errors": errors}
+                    for name, (count, seconds, max_seconds, nbytes, errors) in self.stats.items()]
+        return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+
+
+def bind(func):
+    """ 스레드 풀에 넘길 함수가 현재 구간(작업) 아래에 기록되도록 호출 시점의 문맥을 묶는다 """
+    ctx = contextvars.copy_context()
+    def run(*args, **kwargs):
+        return ctx.copy().run(func, *args, **kwargs)
+    return run
+
+
+tracer = Tracer()
+span = tracer.span
+record = tracer.record
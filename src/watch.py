@@ -0,0 +1,266 @@
+import os
+import time
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pdfinput import forget as forget_input
+
+# 감시 폴더(hot folder) 모드. 스캐너 공유 폴더 등에 들어오는 PDF를 사람이 없어도 계속 처리한다.
+#   1) poll_seconds마다 감시 폴더(하위 폴더 제외)의 .pdf 파일을 확인하고,
+#   2) 크기와 수정 시각이 settle_seconds 동안 바뀌지 않으면 다 쓰인 것으로 보고,
+#   3) 파이프라인 작업(pdfcli 작업 목록의 작업 하나와 같은 형식)을 작업자 스레드에서 실행한 뒤,
+#   4) 원본을 감시 폴더 아래 done/ 또는 failed/로 옮긴다.
+# merge는 파일마다 실행하지 않고 batch_size개가 모이거나 첫 파일 뒤 batch_seconds가 지나면 한 파일로 합친다.
+# 실행 중/대기 중인 작업이 queue_size개면 새 파일을 받지 않고 폴더에 남겨 두었다가 다음 확인 때 가져간다.
+
+WATCH_POLL_SECONDS = 2.0        # 폴더 확인 간격
+WATCH_SETTLE_SECONDS = 5.0      # 크기/수정 시각이 이 시간 동안 같으면 다 쓰인 파일로 봄
+WATCH_WORKERS = 2               # 동시에 실행할 작업 수
+WATCH_QUEUE_SIZE = 8            # 실행 중 + 대기 중인 작업의 최대 수
+WATCH_BATCH_SIZE = 20           # merge: 한 파일로 합칠 최대 입력 수
+WATCH_BATCH_SECONDS = 60.0      # merge: 첫 파일이 들어온 뒤 이 시간이 지나면 모인 만큼 합침
+WATCH_STATUS_SECONDS = 60.0     # 처리량을 출력하는 간격
+THROUGHPUT_WINDOW_SECONDS = 600.0   # 시간당 처리량을 계산할 최근 구간
+THROUGHPUT_MIN_SECONDS = 60.0       # 시작 후 이 시간이 지나기 전에는 시간당 처리량을 계산하지 않음
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+WATCH_OPS = ("split", "render", "merge")
+
+
+class Throughput:
+    """ 처리한 파일 수와 최근 window초 기준 시간당 처리량 """
+    def __init__(self, window=THROUGHPUT_WINDOW_SECONDS):
+        self.window = window
+        self.lock = threading.Lock()
+        self.times = deque()    # 최근 처리 완료 시각 (파일마다 하나)
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    def add(self, files, ok=True):
+        now = time.monotonic()
+        with self.lock:
+            if ok:
+                self.done += files
+            else:
+                self.failed += files
+            self.times.extend([now] * files)
+            self._expire(now)
+
+    def _expire(self, now):
+        while self.times and now - self.times[0] > self.window:
+            self.times.popleft()
+
+    def per_hour(self):
+        """ 시간당 처리량 (시작 직후에는 몇 개만 처리해도 크게 부풀려지므로 THROUGHPUT_MIN_SECONDS 전에는 None) """
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            span = min(self.window, now - self.started)
+            return len(self.times) * 3600 / span if span >= THROUGHPUT_MIN_SECONDS else None
+
+
+class FileSettler:
+    """ 크기와 수정 시각이 settle초 동안 바뀌지 않은 파일만 준비된 것으로 본다 (복사 중인 파일 제외) """
+    def __init__(self, settle=WATCH_SETTLE_SECONDS):
+        self.settle = settle
+        self.seen = {}  # 경로 -> ((크기, 수정 시각 ns), 마지막으로 바뀐 것을 본 시각)
+
+    def poll(self, paths, now):
+        """ 준비된 파일 목록 (오래 기다린 순) """
+        current = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue    # 확인하는 사이에 옮겨지거나 삭제됨
+            if st.st_size == 0:
+                continue    # 아직 내용이 쓰이기 전
+            key = (st.st_size, st.st_mtime_ns)
+            prev = self.seen.get(path)
+            current[path] = prev if prev is not None and prev[0] == key else (key, now)
+        self.seen = current
+        ready = [(since, path) for path, (_, since) in current.items() if now - since >= self.settle]
+        return [path for _, path in sorted(ready)]
+
+    def forget(self, path):
+        self.seen.pop(path, None)
+
+    def __len__(self):
+        return len(self.seen)
+
+
+def move_unique(path, folder):
+    """ path를 folder로 옮긴다. 같은 이름이 있으면 "이름 (2).pdf"처럼 번호를 붙인다. """
+    os.makedirs(folder, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    dest = os.path.join(folder, stem + ext)
+    n = 2
+    while os.path.exists(dest):
+        dest = os.path.join(folder, f"{stem} ({n}){ext}")
+        n += 1
+    shutil.move(path, dest)
+    return dest
+
+
+def same_folder_key(path):
+    """ 같은 폴더인지 비교하기 위한 경로 (심볼릭 링크, 대소문자 구분 없는 파일 시스템 고려) """
+    return os.path.normcase(os.path.realpath(path))
+
+
+class HotFolder:
+    """ 감시 폴더의 새 PDF에 pipeline 작업을 자동으로 적용한다.
+        pipeline: {"op": "split"|"render"|"merge", "output": 출력 폴더, ...} (pdfcli 작업에서 inputs를 뺀 것)
+        handler(job): 작업 하나를 실행하고 출력 목록을 반환하는 함수 (pdfcli.run_job) """
+    def __init__(self, folders, pipeline, handler, workers=WATCH_WORKERS, queue_size=WATCH_QUEUE_SIZE,
+                 settle=WATCH_SETTLE_SECONDS, poll=WATCH_POLL_SECONDS, batch_size=WATCH_BATCH_SIZE,
+                 batch_seconds=WATCH_BATCH_SECONDS, log=print):
+        if pipeline.get("op") not in WATCH_OPS:
+            raise ValueError(f"감시 모드에서 사용할 수 없는 작업: {pipeline.get('op')}")
+        if not pipeline.get("output"):
+            raise ValueError("output(출력 폴더)이 필요합니다.")
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        output = same_folder_key(pipeline["output"])
+        for folder in self.folders:
+            if same_folder_key(folder) == output:
+                # 출력 파일이 다시 입력으로 처리되어 끝나지 않는다
+                raise ValueError(f"출력 폴더가 감시 폴더와 같습니다: {folder}")
+        self.pipeline = dict(pipeline)
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.slots = threading.BoundedSemaphore(max(self.workers, int(queue_size)))
+        self.poll_seconds = poll
+        self.batch_size = max(1, int(batch_size))
+        self.batch_seconds = batch_seconds
+        self.output = log
+        self.log_lock = threading.Lock()
+        self.settler = FileSettler(settle)
+        self.throughput = Throughput()
+        self.lock = threading.Lock()
+        self.in_flight = set()  # 작업에 넘겼지만 아직 옮기지 않은 파일
+        self.unmovable = set()  # 처리했지만 옮기지 못한 파일 (다시 처리하지 않음)
+        self.batch = []         # merge: 모으는 중인 파일
+        self.batch_started = None
+        self.batch_count = 0
+        self.pool = None
+
+    def log(self, message):
+        # 작업자 스레드에서도 부르므로 한 줄씩 차례로 출력한다
+        with self.log_lock:
+            self.output(message)
+
+    def scan(self):
+        """ 감시 폴더 바로 아래의 .pdf 파일 (숨김/작업 중 파일 제외) """
+        with self.lock:
+            busy = self.in_flight | self.unmovable | set(self.batch)
+        paths = []
+        for folder in self.folders:
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue    # 네트워크 공유가 잠시 끊긴 경우 다음 확인 때 다시 시도
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.lower().endswith(".pdf"):
+                    continue
+                if entry.path not in busy and entry.is_file():
+                    paths.append(entry.path)
+        return paths
+
+    def pending(self):
+        """ 아직 끝나지 않은 파일 수 (다 쓰이기를 기다리는 파일 + 모으는 중 + 실행 중) """
+        with self.lock:
+            return len(self.settler) + len(self.batch) + len(self.in_flight)
+
+    def submit(self, inputs):
+        # 대기열이 가득 차면 False (파일은 폴더에 남아 다음 확인 때 다시 시도)
+        if not self.slots.acquire(blocking=False):
+            return False
+        with self.lock:
+            self.in_flight.update(inputs)
+        for path in inputs:
+            self.settler.forget(path)
+        self.pool.submit(self.process, self.build_job(inputs))
+        return True
+
+    def build_job(self, inputs):
+        job = dict(self.pipeline, inputs=list(inputs))
+        if job["op"] == "merge":
+            self.batch_count += 1
+            name = f"merged_{time.strftime('%Y%m%d_%H%M%S')}_{self.batch_count:04d}.pdf"
+            job["output"] = os.path.join(self.pipeline["output"], name)
+        return job
+
+    def process(self, job):
+        inputs = job["inputs"]
+        names = ", ".join(os.path.basename(path) for path in inputs)
+        try:
+            try:
+                outputs = [str(output) for output in self.handler(job)]
+                ok = True
+                more = f" 외 {len(outputs) - 1}개" if len(outputs) > 1 else ""
+                self.log(f"OK {job['op']} {names} -> {outputs[0] if outputs else ''}{more}")
+            except Exception as e:
+                ok = False
+                self.log(f"FAIL {job['op']} {names}: {e}")
+            for path in inputs:
+                try:
+                    forget_input(path)  # 입력 캐시의 매핑을 닫아야 옮길 수 있다 (Windows)
+                    move_unique(path, os.path.join(os.path.dirname(path), DONE_DIR if ok else FAILED_DIR))
+                except OSError as e:
+                    with self.lock:
+                        self.unmovable.add(path)
+                    self.log(f"원본을 옮기지 못했습니다: {path}: {e}")
+            self.throughput.add(len(inputs), ok)
+        finally:
+            with self.lock:
+                self.in_flight.difference_update(inputs)
+            self.slots.release()
+
+    def poll_once(self, flush=False):
+        """ 폴더를 한 번 확인하고 준비된 파일을 작업에 넘긴다. flush이면 모으는 중인 merge 묶음도 바로 실행. """
+        now = time.monotonic()
+        ready = self.settler.poll(self.scan(), now)
+        if self.pipeline["op"] != "merge":
+            for path in ready:
+                if not self.submit([path]):
+                    break
+            return
+        for path in ready:
+            self.settler.forget(path)
+            if self.batch_started is None:
+                self.batch_started = now
+            self.batch.append(path)
+        while self.batch and (len(self.batch) >= self.batch_size or flush
+                              or now - self.batch_started >= self.batch_seconds):
+            group = self.batch[:self.batch_size]
+            if not self.submit(group):
+                break
+            del self.batch[:len(group)]
+            self.batch_started = now if self.batch else None
+
+    def status(self):
+        t = self.throughput
+        per_hour = t.per_hour()
+        rate = "측정 중" if per_hour is None else f"{per_hour:.0f}개"
+        return f"처리 {t.done}개, 실패 {t.failed}개, 시간당 {rate}, 남은 파일 {self.pending()}개"
+
+    def run(self, stop=None, once=False, status_seconds=WATCH_STATUS_SECONDS):
+        """ stop(threading.Event)이 설정될 때까지 감시한다.
+            once이면 지금 폴더에 있는 파일을 모두 처리한 뒤 끝낸다. """
+        stop = stop or threading.Event()
+        for folder in self.folders:
+            os.makedirs(folder, exist_ok=True)
+        os.makedirs(self.pipeline["output"], exist_ok=True)
+        last_status = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch") as self.pool:
+            while not stop.is_set():
+                self.poll_once(flush=once)
+                if once and not self.pending():
+                    break
+                if time.monotonic() - last_status >= status_seconds:
+                    self.log(self.status())
+                    last_status = time.monotonic()
+                stop.wait(self.poll_seconds)
+        self.log(self.status())
+        return self.throughput
@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """ 작업 기록/색인 캐시를 테스트마다 임시 폴더에 둔다 """
+    folder = tmp_path / "cache"
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(folder))
+    return folder
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """ make_pdf(이름, 페이지 수) -> 합성 텍스트 PDF 경로 """
+    from benchmark import make_pdf as build
+
+    def make(name, pages=2):
+        path = tmp_path / name
+        build(str(path), pages, "text", seed=len(name))
+        return str(path)
+    return make
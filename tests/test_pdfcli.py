@@ -0,0 +1,18 @@
+import os
+from PyPDF2 import PdfReader
+from pdfcli import main, run_job
+
+
+def test_merge_creates_nested_output_folder(tmp_path, make_pdf):
+    a, b = make_pdf("a.pdf", 2), make_pdf("b.pdf", 3)
+    output = tmp_path / "out" / "sub" / "m.pdf"
+    assert main(["merge", str(output), a, b]) == 0
+    assert len(PdfReader(str(output)).pages) == 5
+
+
+def test_manifest_merge_job_with_nested_output(tmp_path, make_pdf):
+    a, b = make_pdf("a.pdf", 1), make_pdf("b.pdf", 1)
+    output = tmp_path / "sub" / "x.pdf"
+    run_job({"op": "merge", "inputs": [a, b], "output": str(output)})
+    assert len(PdfReader(str(output)).pages) == 2
+    assert not [name for name in os.listdir(output.parent) if name.endswith(".part")]
@@ -0,0 +1,41 @@
+from PyPDF2 import PdfReader
+from benchmark import pdf_bytes
+from pdfcore import pruned_page, shared_resource_ids, split_pdf
+
+
+def two_font_pdf(path, shared):
+    """ 페이지마다 /F1 또는 /F2만 쓰는 2쪽 PDF. shared이면 두 페이지가 같은 /Resources를 참조한다. """
+    fonts = b"<< /Font << /F1 5 0 R /F2 6 0 R >> >>"
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >>",
+        5: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        6: b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+        7: b"<< /Length 22 >>\nstream\nBT /F1 12 Tf (a) Tj ET\nendstream",
+        8: b"<< /Length 22 >>\nstream\nBT /F2 12 Tf (b) Tj ET\nendstream",
+    }
+    resources = b"9 0 R" if shared else fonts
+    if shared:
+        objects[9] = fonts
+    for idnum, content in ((3, 7), (4, 8)):
+        objects[idnum] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Resources %s /Contents %d 0 R >>" \
+            % (resources, content)
+    path.write_bytes(pdf_bytes(objects, 1))
+
+
+def test_shared_resources_are_pruned_per_page(tmp_path):
+    src = tmp_path / "shared.pdf"
+    two_font_pdf(src, shared=True)
+    outputs = split_pdf(str(src), str(tmp_path), "all", workers=1)
+    fonts = [sorted(PdfReader(path).pages[0]["/Resources"]["/Font"]) for path in outputs]
+    assert fonts == [["/F1"], ["/F2"]]
+    assert sorted(PdfReader(str(src)).pages[0]["/Resources"]["/Font"]) == ["/F1", "/F2"]
+
+
+def test_page_own_resources_are_passed_through(tmp_path):
+    src = tmp_path / "own.pdf"
+    two_font_pdf(src, shared=False)
+    reader = PdfReader(str(src))
+    shared = shared_resource_ids(reader)
+    assert not shared
+    assert all(pruned_page(page, shared) is page for page in reader.pages)
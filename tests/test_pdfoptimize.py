@@ -0,0 +1,31 @@
+from PyPDF2 import PdfReader
+from benchmark import pdf_bytes
+from pdfoptimize import optimize_pdf
+
+
+def untyped_annotation_pdf(path):
+    """ 두 페이지에 /Type이 없는 같은 내용의 링크 주석이 하나씩 있는 PDF (목차 항목도 /Type 없음) """
+    link = b"<< /Subtype /Link /Rect [10 10 100 40] /Border [0 0 0] /A << /S /URI /URI (https://example.com) >> >>"
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R /Outlines 7 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >>",
+        3: b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Annots [5 0 R] >>",
+        4: b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Annots [6 0 R] >>",
+        5: link,
+        6: link,
+        7: b"<< /First 8 0 R /Last 9 0 R /Count 2 >>",
+        8: b"<< /Title (A) /Parent 7 0 R /Next 9 0 R /Dest [3 0 R /Fit] >>",
+        9: b"<< /Title (A) /Parent 7 0 R /Prev 8 0 R /Dest [3 0 R /Fit] >>",
+    }
+    path.write_bytes(pdf_bytes(objects, 1))
+
+
+def test_untyped_annotations_and_outline_items_are_not_merged(tmp_path):
+    src, dst = tmp_path / "annots.pdf", tmp_path / "optimized.pdf"
+    untyped_annotation_pdf(src)
+    optimize_pdf(str(src), str(dst))
+    reader = PdfReader(str(dst))
+    annots = [page.raw_get("/Annots")[0].idnum for page in reader.pages]
+    assert len(set(annots)) == 2
+    first = reader.trailer["/Root"]["/Outlines"].raw_get("/First")
+    assert first.get_object().raw_get("/Next").idnum != first.idnum